@@ -0,0 +1,101 @@
+import functools
+import logging
+import os
+from typing import Callable
+
+from pydantic_ai import Agent
+
+from metrics import MetricsAgent
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# Lazy Instrumentation
+# ============================================================================
+
+@functools.cache
+def load_environment() -> None:
+    """Load ``.env`` once, on first use rather than at import."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+@functools.cache
+def configure_instrumentation() -> None:
+    """
+    Configure logfire and pydantic-ai instrumentation once per process.
+
+    Set ``LOGFIRE_ENABLED=0`` to skip instrumentation entirely.
+    """
+    load_environment()
+    if os.getenv("LOGFIRE_ENABLED", "1").lower() in ("0", "false", "no"):
+        return
+    import logfire
+
+    logfire.configure()
+    logfire.instrument_pydantic_ai()
+
+
+# ============================================================================
+# Agent Registry
+# ============================================================================
+
+class AgentRegistry:
+    """
+    Builds agents on first use instead of at module import.
+
+    Factories are registered by name and run once; ``setup`` runs before the
+    first agent is built, e.g. to load ``.env`` or configure instrumentation.
+    Built agents are wrapped in ``MetricsAgent`` so every run is timed.
+    """
+
+    def __init__(self, setup: Callable[[], None] | None = None):
+        self._setup = setup
+        self._factories: dict[str, Callable[[], Agent]] = {}
+        self._agents: dict[str, Agent] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+    def __iter__(self):
+        return iter(self._factories)
+
+    def register(self, name: str):
+        """Decorator registering ``factory`` as the builder for agent ``name``."""
+        def decorator(factory: Callable[[], Agent]) -> Callable[[], Agent]:
+            self._factories[name] = factory
+            return factory
+
+        return decorator
+
+    def get(self, name: str) -> MetricsAgent:
+        """
+        Return agent ``name``, building it on first access.
+
+        Raises:
+            KeyError: If no factory is registered under ``name``
+        """
+        agent = self._agents.get(name)
+        if agent is None:
+            factory = self._factories[name]
+            if self._setup is not None:
+                self._setup()
+            agent = self._agents[name] = MetricsAgent(factory(), default_name=name)
+            logger.debug(f"Built agent {name}")
+        return agent
+
+    def module_getattr(self, module_name: str):
+        """
+        Build a module-level ``__getattr__`` exposing registered agents.
+
+        Keeps ``from agents import balance_sheet_agent`` working while the
+        agent itself is only constructed when that import actually runs.
+        """
+        def __getattr__(name: str) -> MetricsAgent:
+            if name in self._factories:
+                return self.get(name)
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+
+        return __getattr__
@@ -3,38 +3,63 @@ import asyncio
 from dataclasses import dataclass
 import os
 import time
-from dotenv import load_dotenv
 from pydantic_ai import Agent, RunContext
-load_dotenv()
+from agent_registry import AgentRegistry, load_environment
+from model_registry import get_model
+from hedging import hedged_model
+from llm_cache import cached_model
+from metrics import timed_tool
+from statement_store import lookup_statement
+from symbol_index import get_symbol_index
+from tool_cache import cached_statement
+from tool_resilience import resilient_tool
+
+# Agents are built on first access, keeping this module cheap to import.
+registry = AgentRegistry(setup=load_environment)
+__getattr__ = registry.module_getattr(__name__)
 
 
 @dataclass
 class CompanySymbol :
     symbol : str
 
-company_name_provider_agent = Agent(
-    model = "gpt-4o",
-    name = "company_name_provider_agent",
-    system_prompt=f"""You are a company name provider agent. You will be provided with a user financial query. Your job is to get the company that is in scope and return its comapany symbol.""",
-    output_type=CompanySymbol,
-    instrument=True
-
-)
-
-@company_name_provider_agent.tool
+@registry.register("company_name_provider_agent")
+def build_company_name_provider_agent() -> Agent:
+    agent = Agent(
+        model = hedged_model(get_model("gpt-4o")),
+        name = "company_name_provider_agent",
+        system_prompt=f"""You are a company name provider agent. You will be provided with a user financial query. Your job is to get the company that is in scope and return its comapany symbol.""",
+        output_type=CompanySymbol,
+        instrument=True
+    )
+    agent.tool(get_company_name)
+    return agent
+
+@timed_tool
 async def get_company_name(ctx: RunContext[None],company_name : str) :
+    match = get_symbol_index().lookup(company_name)
+    if match and match.confident:
+        return CompanySymbol(symbol=match.symbol)
     return CompanySymbol(symbol="RELIANCE.NS")
 
-balance_sheet_agent = Agent(
-    model="gpt-4o",
-    name = "balance_sheet_agent",
-    system_prompt="You fetch balance sheet data for a given company symbol.",
-    instrument=True
-
-)
-
-@balance_sheet_agent.tool
+@registry.register("balance_sheet_agent")
+def build_balance_sheet_agent() -> Agent:
+    agent = Agent(
+        model=cached_model(get_model("gpt-4o")),
+        name = "balance_sheet_agent",
+        system_prompt="You fetch balance sheet data for a given company symbol.",
+        instrument=True
+    )
+    agent.tool(get_balance_sheet)
+    return agent
+
+@timed_tool
+@resilient_tool("balance_sheet")
+@cached_statement("balance_sheet")
 async def get_balance_sheet(ctx: RunContext[None], symbol: str) -> dict:
+    stored = lookup_statement("balance_sheet", symbol)
+    if stored is not None:
+        return stored
     start = time.time()
     await asyncio.sleep(1)
     end_time = time.time()
@@ -51,14 +76,23 @@ async def get_balance_sheet(ctx: RunContext[None], symbol: str) -> dict:
 # AGENT 2: Cash Flow Agent
 # =====================================================================
 
-cash_flow_agent = Agent(
-    model="gpt-4o",
-    name = "cash_flow_agent",
-    system_prompt="You fetch cash flow data for a given company symbol.",
-)
-
-@cash_flow_agent.tool
+@registry.register("cash_flow_agent")
+def build_cash_flow_agent() -> Agent:
+    agent = Agent(
+        model=cached_model(get_model("gpt-4o")),
+        name = "cash_flow_agent",
+        system_prompt="You fetch cash flow data for a given company symbol.",
+    )
+    agent.tool(get_cash_flow)
+    return agent
+
+@timed_tool
+@resilient_tool("cash_flow")
+@cached_statement("cash_flow")
 async def get_cash_flow(ctx: RunContext[None], symbol: str) -> dict:
+    stored = lookup_statement("cash_flow", symbol)
+    if stored is not None:
+        return stored
     raise RuntimeError("Manual cash flow failure for retry")
 
     start = time.time()
@@ -72,8 +106,10 @@ async def get_cash_flow(ctx: RunContext[None], symbol: str) -> dict:
         "free_cash_flow": 95838000000,
     }
 
-summarizer_agent = Agent(
-    model="gpt-4o",
-    name = "summarizer_agent",
-    system_prompt="You are a summarizer agent. You will recieve company balance sheet and cash flow financial information. Your job is to create a brief summary for that information"
-)
\ No newline at end of file
+@registry.register("summarizer_agent")
+def build_summarizer_agent() -> Agent:
+    return Agent(
+        model=cached_model(hedged_model(get_model("gpt-4o"))),
+        name = "summarizer_agent",
+        system_prompt="You are a summarizer agent. You will recieve company balance sheet and cash flow financial information. Your job is to create a brief summary for that information"
+    )
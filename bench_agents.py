@@ -0,0 +1,330 @@
+"""
+Offline throughput benchmark for the agent graph and the FastAPI app.
+
+Every agent's model is replaced with a pydantic-ai ``FunctionModel`` that
+sleeps for a sampled latency and reports sampled token usage, so no OpenAI
+calls are made. The graph from ``graph_agents.py`` and the ``/run-agent``
+route from ``main.py`` (through an in-process ASGI client) are driven at
+increasing concurrency, and p50/p95/p99 latency, requests/s and peak RSS
+are reported per level.
+
+    python bench_agents.py --target graph --concurrency 1 8 32 --requests 64
+    python bench_agents.py --target api --latency-ms 400 --json bench.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+# Instrumentation would otherwise require logfire credentials.
+os.environ.setdefault("LOGFIRE_ENABLED", "0")
+# The API target repeats a handful of queries, so coalescing would serve most
+# requests from a shared run and the intent router would skip main_agent.
+# Measure full agent runs unless these are switched on explicitly.
+os.environ.setdefault("RUN_AGENT_COALESCING", "0")
+os.environ.setdefault("INTENT_ROUTER_ENABLED", "0")
+
+# Environment switches that change what an API request does, reported with the results.
+BENCH_SETTINGS = ("RUN_AGENT_COALESCING", "INTENT_ROUTER_ENABLED", "MAIN_AGENT_TOOL_MODE", "LLM_RESPONSE_CACHE")
+
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, TextPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.usage import RequestUsage
+
+ROOT = Path(__file__).resolve().parent
+
+DEFAULT_QUERIES = [
+    "Whats the balance sheet and cash flow of Reliance digital",
+    "Give me the balance sheet of Infosys",
+    "Cash flow for HDFC Bank",
+    "Balance sheet and cash flow of Tata Motors",
+]
+
+# Words in tool names that say nothing about which data a tool returns.
+_GENERIC_TOOL_WORDS = {"get", "delegate", "fetch", "all", "data"}
+
+
+# ============================================================================
+# Simulated Models
+# ============================================================================
+
+@dataclass
+class SimulationProfile:
+    """Latency and token-count distributions for the simulated model."""
+    latency_ms: float = 300.0
+    latency_sigma: float = 0.35
+    input_tokens: int = 600
+    output_tokens: int = 120
+    token_jitter: float = 0.25
+    seed: int = 7
+
+
+def _fill_schema(schema: dict, symbol: str) -> dict:
+    """Build arguments satisfying a simple tool JSON schema."""
+    args = {}
+    for name, prop in schema.get("properties", {}).items():
+        kind = prop.get("type")
+        if kind == "string":
+            args[name] = symbol if "symbol" in name or "company" in name else "simulated"
+        elif kind in ("integer", "number"):
+            args[name] = 0
+        elif kind == "boolean":
+            args[name] = False
+        elif kind == "array":
+            args[name] = []
+        else:
+            args[name] = {}
+    return args
+
+
+def _latest_user_text(messages: list[ModelMessage]) -> str:
+    for message in reversed(messages):
+        if isinstance(message, ModelRequest):
+            for part in message.parts:
+                if part.part_kind == "user-prompt" and isinstance(part.content, str):
+                    return part.content
+    return ""
+
+
+def _matching_tools(info: AgentInfo, prompt: str) -> list:
+    prompt_words = set(prompt.replace("cash flow", "cashflow cash flow").split())
+    return [
+        tool for tool in info.function_tools
+        if (set(tool.name.split("_")) - _GENERIC_TOOL_WORDS) & prompt_words
+    ]
+
+
+def simulated_model(profile: SimulationProfile) -> FunctionModel:
+    """
+    Return a FunctionModel that behaves like a tool-using chat model.
+
+    On the first step of a run it calls the function tools whose names match
+    the prompt (all of them if none match); once tool results are in the
+    history it answers with text, or with the output tool for structured
+    agents.
+    """
+    rng = random.Random(profile.seed)
+
+    def sample_tokens(mean: int) -> int:
+        return max(1, int(rng.gauss(mean, mean * profile.token_jitter)))
+
+    async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        await asyncio.sleep(rng.lognormvariate(0, profile.latency_sigma) * profile.latency_ms / 1000)
+        usage = RequestUsage(input_tokens=sample_tokens(profile.input_tokens), output_tokens=sample_tokens(profile.output_tokens))
+        prompt = _latest_user_text(messages).lower()
+        symbol = next((word.strip(".,?!") for word in prompt.split() if "." in word.strip(".,?!")), "RELIANCE.NS").upper()
+
+        last = messages[-1]
+        has_tool_results = isinstance(last, ModelRequest) and any(isinstance(p, ToolReturnPart) for p in last.parts)
+        if info.function_tools and not has_tool_results:
+            tools = _matching_tools(info, prompt) or info.function_tools
+            return ModelResponse(
+                parts=[ToolCallPart(tool.name, _fill_schema(tool.parameters_json_schema, symbol)) for tool in tools],
+                usage=usage,
+            )
+        if info.output_tools:
+            tool = info.output_tools[0]
+            return ModelResponse(parts=[ToolCallPart(tool.name, _fill_schema(tool.parameters_json_schema, symbol))], usage=usage)
+        words = " ".join("lorem" for _ in range(usage.output_tokens))
+        return ModelResponse(parts=[TextPart(words)], usage=usage)
+
+    return FunctionModel(respond, model_name="simulated")
+
+
+@contextlib.contextmanager
+def override_all_agents(model: FunctionModel, *registries):
+    """Point every agent in the given registries at ``model`` for the duration."""
+    with contextlib.ExitStack() as stack:
+        for registry in registries:
+            for name in registry:
+                stack.enter_context(registry.get(name).override(model=model))
+        yield
+
+
+# ============================================================================
+# Load Generation
+# ============================================================================
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_level(call, queries: list[str], concurrency: int, requests: int) -> dict:
+    """Issue ``requests`` calls with at most ``concurrency`` in flight and summarise them."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def one(index: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call(queries[index % len(queries)])
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - start)
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    wall = time.perf_counter() - wall_start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "wall_seconds": round(wall, 4),
+        "requests_per_second": round(len(latencies) / wall, 3) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def graph_target():
+    """Return a callable running the full graph for one query."""
+    import graph_agents
+
+    graph = graph_agents.Graph(
+        nodes=(graph_agents.CompanyNameResolver, graph_agents.BalanceSheetAndCashflow, graph_agents.Summarizer)
+    )
+
+    async def call(query: str):
+        state = graph_agents.CompanyState(user_query=query)
+        return await graph.run(graph_agents.CompanyNameResolver(), state=state)
+
+    return call, [graph_agents.registry]
+
+
+@contextlib.asynccontextmanager
+async def api_target():
+    """Yield a callable posting one query to ``/run-agent`` through an in-process ASGI client."""
+    import httpx
+
+    import agents
+    import main
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def call(query: str):
+            response = await client.post("/run-agent", json={"company": "RELIANCE.NS", "query": query})
+            response.raise_for_status()
+            return response
+
+        yield call, [main.registry, agents.registry]
+
+
+# ============================================================================
+# Entry Point
+# ============================================================================
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmarks(args: argparse.Namespace) -> dict:
+    from tool_cache import financial_data_cache
+
+    profile = SimulationProfile(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        input_tokens=args.input_tokens,
+        output_tokens=args.output_tokens,
+        seed=args.seed,
+    )
+    model = simulated_model(profile)
+    if args.no_tool_cache:
+        # Entries expire immediately; concurrent misses still share one fetch.
+        financial_data_cache.ttl_seconds = 0
+
+    settings = {name: os.getenv(name) for name in BENCH_SETTINGS}
+    print("settings: " + " ".join(f"{name}={value}" for name, value in settings.items()))
+
+    results = []
+    targets = ["graph", "api"] if args.target == "all" else [args.target]
+    for target in targets:
+        async with contextlib.AsyncExitStack() as stack:
+            if target == "graph":
+                call, registries = graph_target()
+            else:
+                call, registries = await stack.enter_async_context(api_target())
+            stack.enter_context(override_all_agents(model, *registries))
+            for concurrency in args.concurrency:
+                financial_data_cache.invalidate()
+                level = await run_level(call, args.queries, concurrency, args.requests)
+                results.append({"target": target, **level})
+                print(
+                    f"{target:<6} c={concurrency:<4} rps={level['requests_per_second']:<8} "
+                    f"p50={level['p50_ms']}ms p95={level['p95_ms']}ms p99={level['p99_ms']}ms "
+                    f"errors={level['errors']} rss={level['peak_rss_mb']}MiB"
+                )
+
+    return {
+        "meta": {
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "profile": asdict(profile),
+            "requests_per_level": args.requests,
+            "tool_cache": not args.no_tool_cache,
+            "settings": settings,
+        },
+        "results": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["graph", "api", "all"], default="all")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=64, help="requests per concurrency level")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="median simulated model latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.35, help="lognormal sigma of model latency")
+    parser.add_argument("--input-tokens", type=int, default=600, help="mean input tokens per model request")
+    parser.add_argument("--output-tokens", type=int, default=120, help="mean output tokens per model request")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--queries", nargs="+", default=DEFAULT_QUERIES)
+    parser.add_argument("--no-tool-cache", action="store_true", help="expire financial data cache entries immediately")
+    parser.add_argument("--json", dest="json_path", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    # Claim the root logger first so the INFO-level basicConfig in main.py is a no-op.
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(run_benchmarks(args))
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
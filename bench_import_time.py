@@ -0,0 +1,87 @@
+"""
+Import-time budget check for the API and worker entry modules.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter for
+each module, takes the median cumulative import time over several runs and
+exits non-zero if any module exceeds its budget.
+
+    python bench_import_time.py
+    python bench_import_time.py --runs 5 --scale 1.5 --json import_times.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+# Budgets in milliseconds of cumulative import time. Importing pydantic-ai and
+# FastAPI alone accounts for most of this; anything that builds agents, opens
+# clients or configures instrumentation at import will blow through it.
+# Modules pulling in the metrics engine or the statement store also pay about
+# 200 ms for NumPy.
+MODULE_BUDGETS_MS = {
+    "main": 1800,
+    "agents": 1400,
+    "graph_agents": 1400,
+    "sequential_agents": 1300,
+    # Graph modules load in run_workers, so only the Temporal SDK counts here.
+    "temporal_worker": 800,
+}
+
+
+def measure_import_ms(module: str) -> float:
+    """Return the cumulative import time of ``module`` in a fresh interpreter."""
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "PYTHONDONTWRITEBYTECODE": "1"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+    for line in reversed(proc.stderr.splitlines()):
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() == module and not name[1:].startswith(" "):
+            return int(cumulative) / 1000
+    raise RuntimeError(f"No importtime entry found for {module}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=list(MODULE_BUDGETS_MS), help="modules to check")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per module; the median is used")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=float(os.getenv("IMPORT_BUDGET_SCALE", "1.0")),
+        help="multiply every budget, e.g. for slower CI hosts",
+    )
+    parser.add_argument("--json", dest="json_path", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    failed = False
+    for module in args.modules:
+        samples = [measure_import_ms(module) for _ in range(args.runs)]
+        median = statistics.median(samples)
+        budget = MODULE_BUDGETS_MS.get(module, float("inf")) * args.scale
+        ok = median <= budget
+        failed |= not ok
+        results[module] = {"median_ms": round(median, 1), "budget_ms": budget, "ok": ok}
+        print(f"{'OK  ' if ok else 'FAIL'} {module:<20} {median:8.1f} ms  (budget {budget:.0f} ms)")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(results, indent=2))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
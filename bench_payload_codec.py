@@ -0,0 +1,288 @@
+"""
+Payload size and codec cost benchmark for the Temporal workflows.
+
+Builds payloads shaped like what the graph workflows put into history
+(model message histories from agent activities, ``FinancialData`` results
+and graph checkpoints), converts them with the pydantic data converter and
+reports bytes and encode/decode time per payload with and without each
+compression codec.
+
+Rows are labelled with the encoding the codec actually wrote; ``zstd`` is
+skipped when ``zstandard`` isn't installed rather than silently measured as
+zlib.
+
+With ``--history`` (JSON exported by ``temporal workflow show -o json``),
+each history is replayed under the codec it was recorded with, detected from
+its payloads' ``encoding`` metadata (a history can't be replayed under
+another codec). Decoding its compressed payloads is timed on its own, which
+is the codec's share of the replay cost.
+
+    python bench_payload_codec.py
+    python bench_payload_codec.py --messages 40 --threshold 512 --json codec.json
+    python bench_payload_codec.py --graph per_node --history wf1.json wf2.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Instrumentation would otherwise require logfire credentials.
+os.environ.setdefault("LOGFIRE_ENABLED", "0")
+
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from temporalio.api.common.v1 import Payload
+from temporalio.contrib.pydantic import pydantic_data_converter
+
+from payload_codec import ENCODINGS, CompressionCodec, zstd_available
+
+LINE_ITEMS = [
+    "Total Revenue", "Cost of Revenue", "Gross Profit", "Operating Expense", "Operating Income",
+    "Total Assets", "Total Liabilities", "Stockholders Equity", "Cash And Cash Equivalents",
+    "Operating Cash Flow", "Capital Expenditure", "Free Cash Flow", "Total Debt", "Net Income",
+]
+
+
+# ============================================================================
+# Synthetic Payloads
+# ============================================================================
+
+def statement(rng: random.Random, kind: str, years: int = 4) -> dict:
+    """A yfinance-style statement: line item -> {period: value}."""
+    periods = [f"{2024 - i}-03-31 00:00:00" for i in range(years)]
+    return {
+        "type": kind,
+        "data": {item: {p: round(rng.uniform(1e8, 1e12), 2) for p in periods} for item in LINE_ITEMS},
+    }
+
+
+def message_history(rng: random.Random, turns: int) -> list[ModelMessage]:
+    """An agent run's messages: a prompt, then tool call/return rounds carrying statements."""
+    messages: list[ModelMessage] = [
+        ModelRequest(parts=[
+            SystemPromptPart(content="You are a financial analyst. Use the tools to fetch statements."),
+            UserPromptPart(content="Whats the balance sheet and cash flow of Reliance digital"),
+        ])
+    ]
+    for i in range(turns):
+        kind = "balance_sheet" if i % 2 == 0 else "cash_flow"
+        tool = f"get_{kind}"
+        messages.append(ModelResponse(parts=[ToolCallPart(tool, {"symbol": "RELIANCE.NS"}, tool_call_id=f"call_{i}")]))
+        messages.append(ModelRequest(parts=[ToolReturnPart(tool, statement(rng, kind), tool_call_id=f"call_{i}")]))
+    messages.append(ModelResponse(parts=[TextPart(content="Reliance's balance sheet shows ... " * 20)]))
+    return messages
+
+
+def sample_payloads(rng: random.Random, turns: int) -> dict[str, object]:
+    history = message_history(rng, turns)
+    return {
+        "symbol": {"symbol": "RELIANCE.NS"},
+        "financial_data": statement(rng, "balance_sheet"),
+        "message_history": history,
+        "graph_checkpoint": {
+            "graph": "financial", "node": "Summarizer", "step": 2,
+            "node_data": {"balance_sheet_data": statement(rng, "balance_sheet"),
+                          "cash_flow_data": statement(rng, "cash_flow"), "errors": []},
+            "state": {"user_query": "Whats the balance sheet and cash flow of Reliance digital"},
+            "snapshot_id": "Summarizer:0f8c", "created_at": "2026-01-01T00:00:00+00:00",
+        },
+    }
+
+
+# ============================================================================
+# Measurements
+# ============================================================================
+
+async def time_codec(codec: CompressionCodec, payload, repeats: int) -> dict:
+    encode_s, decode_s = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        encoded = await codec.encode([payload])
+        encode_s.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        await codec.decode(encoded)
+        decode_s.append(time.perf_counter() - start)
+    encoding = encoded[0].metadata.get("encoding", b"")
+    return {
+        "bytes": encoded[0].ByteSize(),
+        "encoding": encoding.decode(),
+        "compressed": encoding in ENCODINGS.values(),
+        "encode_us": round(statistics.median(encode_s) * 1e6, 1),
+        "decode_us": round(statistics.median(decode_s) * 1e6, 1),
+    }
+
+
+def available_codecs(names: list[str], threshold: int) -> dict[str, CompressionCodec]:
+    """Codecs to benchmark, leaving out zstd when ``zstandard`` is missing instead of measuring zlib twice."""
+    codecs = {}
+    for name in names:
+        if name == "zstd" and not zstd_available():
+            print("skipping zstd: 'zstandard' is not installed")
+            continue
+        codecs[name] = CompressionCodec(name, threshold=threshold)
+    return codecs
+
+
+async def measure_payloads(args: argparse.Namespace) -> list[dict]:
+    converter = pydantic_data_converter.payload_converter
+    codecs = available_codecs(args.codecs, args.threshold)
+    results = []
+    for name, value in sample_payloads(random.Random(args.seed), args.messages).items():
+        payload = converter.to_payloads([value])[0]
+        row = {"payload": name, "raw_bytes": payload.ByteSize()}
+        for codec_name, codec in codecs.items():
+            row[codec_name] = await time_codec(codec, payload, args.repeats)
+        results.append(row)
+        summary = " ".join(
+            f"{c}={row[c]['bytes']}B ({row[c]['bytes'] / row['raw_bytes']:.0%}, "
+            f"enc {row[c]['encode_us']}us dec {row[c]['decode_us']}us)"
+            for c in codecs
+        )
+        print(f"{name:<18} raw={row['raw_bytes']}B {summary}")
+    return results
+
+
+def history_payloads(message) -> list[Payload]:
+    """Every Payload nested anywhere in a history event (inputs, results, headers, memos...)."""
+    if isinstance(message, Payload):
+        return [message]
+    found = []
+    for field, value in message.ListFields():
+        if field.message_type is None:
+            continue
+        if field.message_type.GetOptions().map_entry:
+            if field.message_type.fields_by_name["value"].message_type is None:
+                continue
+            values = value.values()
+        elif field.is_repeated:
+            values = value
+        else:
+            values = [value]
+        for item in values:
+            found.extend(history_payloads(item))
+    return found
+
+
+def recorded_codec(payloads: list[Payload]) -> str:
+    """The compression a history was recorded with: ``none``, ``zlib`` or ``zstd``."""
+    encodings = {payload.metadata.get("encoding") for payload in payloads}
+    used = sorted(name for name, encoding in ENCODINGS.items() if encoding in encodings)
+    return "+".join(used) or "none"
+
+
+async def time_decode(payloads: list[Payload], repeats: int) -> float:
+    """Median milliseconds to decode a history's compressed payloads."""
+    compressed = [payload for payload in payloads if payload.metadata.get("encoding") in ENCODINGS.values()]
+    if not compressed:
+        return 0.0
+    codec = CompressionCodec("zlib")  # decoding follows each payload's own encoding metadata
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await codec.decode(compressed)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def measure_replay(args: argparse.Namespace) -> list[dict]:
+    from pydantic_ai.durable_exec.temporal import PydanticAIPlugin
+    from temporalio.client import WorkflowHistory
+    from temporalio.worker import Replayer
+
+    from payload_codec import PayloadCompressionPlugin
+    from temporal_worker import GRAPHS, load_graph_module
+
+    module = load_graph_module(args.graph)
+    runner = None
+    if module.__name__ != GRAPHS[args.graph][0]:
+        from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner, SandboxRestrictions
+
+        runner = SandboxedWorkflowRunner(
+            restrictions=SandboxRestrictions.default.with_passthrough_modules(module.__name__)
+        )
+    results = []
+    for path in args.history:
+        history = WorkflowHistory.from_json(Path(path).stem, json.loads(Path(path).read_text()))
+        payloads = [payload for event in history.events for payload in history_payloads(event)]
+        codec_name = recorded_codec(payloads)
+        row = {
+            "history": path,
+            "codec": codec_name,
+            "events": len(history.events),
+            "payloads": len(payloads),
+            "payload_bytes": sum(payload.ByteSize() for payload in payloads),
+        }
+        if "zstd" in codec_name and not zstd_available():
+            row["skipped"] = "recorded with zstd but 'zstandard' is not installed"
+            print(f"replay {path}: skipped, {row['skipped']}")
+            results.append(row)
+            continue
+
+        plugins = [PydanticAIPlugin()]
+        if codec_name != "none":
+            algorithm = codec_name.split("+")[0]
+            plugins.append(PayloadCompressionPlugin(CompressionCodec(algorithm, threshold=args.threshold)))
+        replayer = Replayer(
+            workflows=[module.FinancialGraphWorkflow],
+            plugins=plugins,
+            **({"workflow_runner": runner} if runner else {}),
+        )
+        start = time.perf_counter()
+        outcome = await replayer.replay_workflows([history], raise_on_replay_failure=False)
+        elapsed = time.perf_counter() - start
+        row["replay_ms"] = round(elapsed * 1000, 1)
+        row["decode_ms"] = round(await time_decode(payloads, args.repeats), 3)
+        row["failures"] = [str(error) for error in outcome.replay_failures.values() if error is not None]
+        results.append(row)
+        print(
+            f"replay {path} codec={codec_name} events={row['events']} {row['replay_ms']}ms "
+            f"(decode {row['decode_ms']}ms) failures={len(row['failures'])}"
+        )
+    return results
+
+
+async def run_benchmarks(args: argparse.Namespace) -> dict:
+    report = {
+        "meta": {"threshold": args.threshold, "messages": args.messages, "repeats": args.repeats},
+        "payloads": await measure_payloads(args),
+    }
+    if args.history:
+        report["replay"] = await measure_replay(args)
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--codecs", nargs="+", choices=list(ENCODINGS), default=["zlib", "zstd"])
+    parser.add_argument("--threshold", type=int, default=1024, help="payloads below this many bytes stay uncompressed")
+    parser.add_argument("--messages", type=int, default=6, help="tool call rounds in the synthetic message history")
+    parser.add_argument("--repeats", type=int, default=50, help="encode/decode timings per payload, median reported")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--graph", choices=["per_node", "in_workflow"], default="per_node")
+    parser.add_argument("--history", nargs="+", default=[], help="workflow history JSON files to replay")
+    parser.add_argument("--json", dest="json_path", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(run_benchmarks(args))
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
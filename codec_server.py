@@ -0,0 +1,63 @@
+"""
+Codec server so the Temporal UI and CLI can show compressed payloads.
+
+Implements the remote codec protocol: ``POST /encode`` and ``POST /decode``
+take and return ``{"payloads": [...]}`` in protobuf JSON. Point the UI's
+codec endpoint (or ``temporal workflow show --codec-endpoint``) at it. It uses
+the same ``TEMPORAL_PAYLOAD_CODEC`` setting as the workers; decoding works
+for zlib and zstd payloads whatever the setting.
+
+    TEMPORAL_PAYLOAD_CODEC=zlib python codec_server.py
+"""
+import os
+
+from fastapi import FastAPI, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from google.protobuf import json_format
+from temporalio.api.common.v1 import Payloads
+
+from payload_codec import PAYLOAD_CODEC, CompressionCodec, payload_codec
+
+# Origins allowed to call the codec server from the browser, comma-separated.
+CODEC_SERVER_CORS_ORIGINS = os.getenv("CODEC_SERVER_CORS_ORIGINS", "http://localhost:8233").split(",")
+
+# With compression off, /encode is a pass-through and /decode still understands compressed payloads.
+codec = payload_codec() or CompressionCodec(threshold=2**63)
+
+app = FastAPI(title="Temporal Payload Codec Server", version="1.0.0")
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=CODEC_SERVER_CORS_ORIGINS,
+    allow_credentials=True,
+    allow_methods=["POST"],
+    allow_headers=["*"],
+)
+
+
+async def _apply(request: Request, encode: bool) -> Response:
+    payloads = json_format.Parse(await request.body(), Payloads())
+    converted = await (codec.encode if encode else codec.decode)(payloads.payloads)
+    return Response(
+        content=json_format.MessageToJson(Payloads(payloads=converted)),
+        media_type="application/json",
+    )
+
+
+@app.post("/encode")
+async def encode(request: Request) -> Response:
+    return await _apply(request, encode=True)
+
+
+@app.post("/decode")
+async def decode(request: Request) -> Response:
+    return await _apply(request, encode=False)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy", "codec": PAYLOAD_CODEC}
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("CODEC_SERVER_PORT", "8081")))
@@ -0,0 +1,158 @@
+import abc
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, ClassVar
+
+from pydantic_graph import BaseNode, End, GraphRunContext
+from pydantic_graph.nodes import DepsT, NodeRunEndT, StateT
+
+logger = logging.getLogger(__name__)
+
+# Defaults for nodes and calls that don't set their own; 0 means unbounded
+# (no concurrency limit, no deadline), wherever the branches run.
+FANOUT_MAX_CONCURRENCY = int(os.getenv("FANOUT_MAX_CONCURRENCY", "0"))
+FANOUT_BRANCH_TIMEOUT_SECONDS = float(os.getenv("FANOUT_BRANCH_TIMEOUT_SECONDS", "60"))
+
+
+# ============================================================================
+# Branches and Results
+# ============================================================================
+
+@dataclass
+class Branch:
+    """One independent unit of work in a fan-out, e.g. a sub-agent run or a tool call."""
+    name: str
+    call: Callable[[], Awaitable[Any]]
+    timeout_seconds: float | None = None
+
+
+@dataclass
+class BranchError:
+    """Why a branch produced no result."""
+    branch: str
+    error_type: str
+    message: str
+    timed_out: bool = False
+
+    def __str__(self) -> str:
+        return f"{self.branch}: {self.error_type}: {self.message}"
+
+
+def branch_timeout(branch: Branch, default: float | None = None) -> float | None:
+    """
+    Deadline for ``branch``: its own, else ``default``, else ``FANOUT_BRANCH_TIMEOUT_SECONDS``.
+
+    An explicit 0 at any level means no deadline and is returned as None.
+    """
+    for timeout in (branch.timeout_seconds, default, FANOUT_BRANCH_TIMEOUT_SECONDS):
+        if timeout is not None:
+            return timeout or None
+
+
+@dataclass
+class FanOutResult:
+    """Results of the branches that completed, and errors for the rest, keyed by branch name."""
+    results: dict[str, Any] = field(default_factory=dict)
+    errors: dict[str, BranchError] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        return not self.errors
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.results.get(name, default)
+
+
+# ============================================================================
+# Fan-out
+# ============================================================================
+
+async def fan_out(
+    branches: list[Branch],
+    max_concurrency: int | None = None,
+    timeout_seconds: float | None = None,
+) -> FanOutResult:
+    """
+    Run branches concurrently and collect whatever completes.
+
+    A branch that raises or overruns its deadline is recorded as a
+    ``BranchError`` instead of failing the others. Cancellation of the caller
+    still propagates to every branch.
+
+    Args:
+        branches: Branches to run; names must be unique
+        max_concurrency: Most branches in flight at once (defaults to ``FANOUT_MAX_CONCURRENCY``, 0 = all)
+        timeout_seconds: Deadline for branches without their own (defaults to ``FANOUT_BRANCH_TIMEOUT_SECONDS``, 0 = none)
+
+    Returns:
+        FanOutResult with per-branch results and errors
+    """
+    limit = max_concurrency if max_concurrency is not None else FANOUT_MAX_CONCURRENCY
+    semaphore = asyncio.Semaphore(limit if limit > 0 else max(len(branches), 1))
+    outcome = FanOutResult()
+
+    async def run_branch(branch: Branch) -> None:
+        timeout = branch_timeout(branch, timeout_seconds)
+        async with semaphore:
+            # The deadline covers the branch's own run, not time spent queued.
+            deadline = asyncio.timeout(timeout)
+            try:
+                async with deadline:
+                    outcome.results[branch.name] = await branch.call()
+            except Exception as e:
+                if deadline.expired():
+                    outcome.errors[branch.name] = BranchError(
+                        branch.name, "TimeoutError", f"no result within {timeout:g}s", timed_out=True
+                    )
+                else:
+                    # Includes TimeoutErrors the branch raised itself.
+                    outcome.errors[branch.name] = BranchError(branch.name, type(e).__name__, str(e))
+        if branch.name in outcome.errors:
+            logger.warning(f"Fan-out branch failed: {outcome.errors[branch.name]}")
+
+    await asyncio.gather(*(run_branch(branch) for branch in branches))
+    return outcome
+
+
+@dataclass
+class FanOutNode(BaseNode[StateT, DepsT, NodeRunEndT]):
+    """
+    Base for graph nodes that fan out to several branches.
+
+    Subclasses implement ``branches`` and ``next_node``, and a ``run``
+    returning ``self.next_node(ctx, await self.fan_out(ctx))`` (pydantic-graph
+    reads the edges from ``run``'s return annotation). Adding a branch never
+    adds serial latency and a failing branch only shows up in
+    ``FanOutResult.errors``.
+
+    Keeping ``next_node`` free of I/O lets executors such as
+    ``temporal_graph_executor`` run the branches elsewhere and rebuild the
+    outcome themselves.
+    """
+
+    max_concurrency: ClassVar[int | None] = None
+    timeout_seconds: ClassVar[float | None] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # A subclass defining ``run`` is a concrete node: reject it now rather
+        # than when the graph first reaches it.
+        if "run" in cls.__dict__:
+            missing = [
+                name for name in ("branches", "next_node") if getattr(getattr(cls, name), "__isabstractmethod__", False)
+            ]
+            if missing:
+                raise TypeError(f"{cls.__name__} must implement {', '.join(missing)}")
+
+    @abc.abstractmethod
+    def branches(self, ctx: GraphRunContext[StateT, DepsT]) -> list[Branch]:
+        """The branches to run for this node."""
+
+    @abc.abstractmethod
+    def next_node(self, ctx: GraphRunContext[StateT, DepsT], outcome: FanOutResult) -> BaseNode | End[NodeRunEndT]:
+        """Where the graph goes once the branches have finished; must not do I/O."""
+
+    async def fan_out(self, ctx: GraphRunContext[StateT, DepsT]) -> FanOutResult:
+        return await fan_out(self.branches(ctx), self.max_concurrency, self.timeout_seconds)
@@ -0,0 +1,153 @@
+"""
+Vectorized financial ratios over balance sheet and cash flow records.
+
+Statements for any number of symbols are laid out as float64 columns (NaN
+where a figure is missing) and every ratio is computed over all symbols in
+one NumPy pass, so screening thousands of companies costs milliseconds and
+no LLM calls. The summarizer gets the same numbers as a ``metrics`` hand-off
+record instead of deriving them in prose.
+"""
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Iterable
+
+import numpy as np
+
+from handoff import StatementFigures
+
+logger = logging.getLogger(__name__)
+
+# Statement figures the ratios are built from.
+FIGURES = ("assets", "liabilities", "operating_cash_flow", "free_cash_flow")
+
+# Ratio name -> (numerator, denominator), each a figure or "a-b" difference of figures.
+RATIOS = {
+    "assets_to_liabilities": ("assets", "liabilities"),
+    "debt_ratio": ("liabilities", "assets"),
+    "equity_ratio": ("assets-liabilities", "assets"),
+    "fcf_share_of_ocf": ("free_cash_flow", "operating_cash_flow"),
+    "capex_share_of_ocf": ("operating_cash_flow-free_cash_flow", "operating_cash_flow"),
+    "ocf_to_liabilities": ("operating_cash_flow", "liabilities"),
+    "fcf_to_assets": ("free_cash_flow", "assets"),
+}
+
+# Derived absolute figures reported next to the ratios.
+DERIVED = {
+    "equity": "assets-liabilities",
+    "capex": "operating_cash_flow-free_cash_flow",
+}
+
+
+# ============================================================================
+# Columnar Input
+# ============================================================================
+
+@dataclass
+class StatementFrame:
+    """Statement figures for many symbols as aligned float64 columns."""
+    symbols: list[str]
+    columns: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
+def _figures(record: StatementFigures | dict | None) -> tuple[str, dict]:
+    if record is None:
+        return "", {}
+    if isinstance(record, dict):
+        record = StatementFigures.from_dict(record)
+        if record is None:
+            return "", {}
+    return record.symbol.strip().upper(), record.figures
+
+
+def build_frame(
+    records: Iterable[StatementFigures | dict | None], symbols: list[str] | None = None
+) -> StatementFrame:
+    """
+    Align statement records by symbol into one frame.
+
+    Args:
+        records: Balance sheet and cash flow records (``StatementFigures`` or tool
+            dicts) in any order; a symbol's statements are merged
+        symbols: Row order; defaults to the order symbols first appear in
+
+    Returns:
+        StatementFrame with a column per entry of ``FIGURES``
+    """
+    merged: dict[str, dict] = {}
+    for record in records:
+        symbol, figures = _figures(record)
+        if symbol:
+            merged.setdefault(symbol, {}).update(figures)
+    order = [s.strip().upper() for s in symbols] if symbols is not None else list(merged)
+    index = {symbol: row for row, symbol in enumerate(order)}
+    columns = {name: np.full(len(order), np.nan) for name in FIGURES}
+    for symbol, figures in merged.items():
+        row = index.get(symbol)
+        if row is None:
+            continue
+        for name in FIGURES:
+            if name in figures:
+                columns[name][row] = figures[name]
+    return StatementFrame(order, columns)
+
+
+# ============================================================================
+# Metrics
+# ============================================================================
+
+def _term(frame: StatementFrame, expr: str) -> np.ndarray:
+    left, _, right = expr.partition("-")
+    column = frame.columns[left]
+    return column - frame.columns[right] if right else column
+
+
+@dataclass
+class MetricsTable:
+    """Ratios and derived figures per symbol; NaN where inputs were missing or a denominator was zero."""
+    symbols: list[str]
+    columns: dict[str, np.ndarray]
+
+    def row(self, index: int, digits: int = 4) -> dict[str, float]:
+        values = {}
+        for name, column in self.columns.items():
+            value = float(column[index])
+            if math.isfinite(value):
+                values[name] = round(value, digits)
+        return values
+
+    def rows(self, digits: int = 4) -> list[dict]:
+        """One dict per symbol, with undefined metrics left out."""
+        return [{"symbol": symbol, **self.row(i, digits)} for i, symbol in enumerate(self.symbols)]
+
+
+def compute_metrics(frame: StatementFrame) -> MetricsTable:
+    """Compute every ratio in ``RATIOS`` and figure in ``DERIVED`` for all symbols at once."""
+    columns = {name: _term(frame, expr) for name, expr in DERIVED.items()}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for name, (numerator, denominator) in RATIOS.items():
+            den = _term(frame, denominator)
+            columns[name] = np.where(den != 0, _term(frame, numerator) / den, np.nan)
+    return MetricsTable(frame.symbols, columns)
+
+
+def metrics_record(*records: StatementFigures | None) -> StatementFigures | None:
+    """
+    Compute the metrics for one company's statements as a hand-off record.
+
+    Returns:
+        A ``metrics`` StatementFigures for the summarizer prompt, or None when
+        no metric is defined
+    """
+    present = [record for record in records if record is not None]
+    if not present:
+        return None
+    symbol = next((record.symbol for record in present if record.symbol), "")
+    # Records without a symbol (e.g. from model output) still belong to this company.
+    present = [StatementFigures(r.statement, symbol or "_", r.figures) for r in present]
+    table = compute_metrics(build_frame(present))
+    figures = table.row(0) if len(table.symbols) else {}
+    return StatementFigures("metrics", symbol, figures) if figures else None
@@ -5,24 +5,36 @@
 
 
 import asyncio
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
+import json
 import os
 import time
-from dotenv import load_dotenv
 from pydantic_ai import Agent, RunContext
+from agent_registry import AgentRegistry, configure_instrumentation
+from fanout import Branch, BranchError, FanOutNode, FanOutResult
+from financial_metrics import metrics_record
+from handoff import StatementFigures, estimate_tokens, handoff_serializer
+from model_registry import get_model
+from hedging import hedged_model
+from llm_cache import cached_model
+from metrics import registry as metrics_registry, timed_nodes, timed_tool
+from speculation import Speculation
+from statement_store import lookup_statement
+from symbol_index import get_symbol_index
+from tool_cache import cached_statement
+from tool_resilience import resilient_tool
 import logging
 from pydantic_graph import BaseNode, End, Graph, GraphRunContext
-import logfire
-from langfuse import get_client
-load_dotenv()
 
- 
+
 # langfuse = get_client()
 # Agent.instrument_all()
 
 
-logfire.configure()
-logfire.instrument_pydantic_ai()
+# .env loading and logfire instrumentation run when the first agent is built,
+# not at import, so importing this module stays cheap.
+registry = AgentRegistry(setup=configure_instrumentation)
+__getattr__ = registry.module_getattr(__name__)
 
 
 
@@ -30,37 +42,54 @@ logfire.instrument_pydantic_ai()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-
-key = os.getenv("OPENAI_API_KEY")
-print("key", key)
+handoff_tokens = metrics_registry.histogram(
+    "summarizer_handoff_tokens",
+    "Estimated tokens of the statement hand-off in the summarizer prompt, compact vs as JSON.",
+    ("handoff",),
+    buckets=(25, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
 
 @dataclass
 class CompanySymbol :
     symbol : str
 
-company_name_provider_agent = Agent(
-    model = "gpt-4o",
-    name = "company_name_provider_agent",
-    system_prompt=f"""You are a company name provider agent. You will be provided with a user financial query. Your job is to get the company that is in scope and return its comapany symbol.""",
-    output_type=CompanySymbol,
-    instrument=True
-
-)
+@registry.register("company_name_provider_agent")
+def build_company_name_provider_agent() -> Agent:
+    agent = Agent(
+        model = hedged_model(get_model("gpt-4o")),
+        name = "company_name_provider_agent",
+        system_prompt=f"""You are a company name provider agent. You will be provided with a user financial query. Your job is to get the company that is in scope and return its comapany symbol.""",
+        output_type=CompanySymbol,
+        instrument=True
+    )
+    agent.tool(get_company_name)
+    return agent
 
-@company_name_provider_agent.tool
+@timed_tool
 async def get_company_name(ctx: RunContext[None],company_name : str) :
+    match = get_symbol_index().lookup(company_name)
+    if match and match.confident:
+        return CompanySymbol(symbol=match.symbol)
     return CompanySymbol(symbol="RELIANCE.NS")
 
-balance_sheet_agent = Agent(
-    model="gpt-4o",
-    name = "balance_sheet_agent",
-    system_prompt="You fetch balance sheet data for a given company symbol.",
-    instrument=True
-
-)
+@registry.register("balance_sheet_agent")
+def build_balance_sheet_agent() -> Agent:
+    agent = Agent(
+        model=cached_model(get_model("gpt-4o")),
+        name = "balance_sheet_agent",
+        system_prompt="You fetch balance sheet data for a given company symbol.",
+        instrument=True
+    )
+    agent.tool(get_balance_sheet)
+    return agent
 
-@balance_sheet_agent.tool
+@timed_tool
+@resilient_tool("balance_sheet")
+@cached_statement("balance_sheet")
 async def get_balance_sheet(ctx: RunContext[None], symbol: str) -> dict:
+    stored = lookup_statement("balance_sheet", symbol)
+    if stored is not None:
+        return stored
     start = time.time()
     logger.info(f"🚀 [BALANCE] Started for {symbol} at {start:.2f}")
     await asyncio.sleep(1)
@@ -81,14 +110,23 @@ async def get_balance_sheet(ctx: RunContext[None], symbol: str) -> dict:
 # AGENT 2: Cash Flow Agent
 # =====================================================================
 
-cash_flow_agent = Agent(
-    model="gpt-4o",
-    name = "cash_flow_agent",
-    system_prompt="You fetch cash flow data for a given company symbol.",
-)
+@registry.register("cash_flow_agent")
+def build_cash_flow_agent() -> Agent:
+    agent = Agent(
+        model=cached_model(get_model("gpt-4o")),
+        name = "cash_flow_agent",
+        system_prompt="You fetch cash flow data for a given company symbol.",
+    )
+    agent.tool(get_cash_flow)
+    return agent
 
-@cash_flow_agent.tool
+@timed_tool
+@resilient_tool("cash_flow")
+@cached_statement("cash_flow")
 async def get_cash_flow(ctx: RunContext[None], symbol: str) -> dict:
+    stored = lookup_statement("cash_flow", symbol)
+    if stored is not None:
+        return stored
     start = time.time()
     logger.info(f"🚀 [CASHFLOW] Started for {symbol} at {start:.2f}")
     await asyncio.sleep(1)
@@ -104,11 +142,19 @@ async def get_cash_flow(ctx: RunContext[None], symbol: str) -> dict:
         "free_cash_flow": 95838000000,
     }
 
-summarizer_agent = Agent(
-    model="gpt-4o",
-    name = "summarizer_agent",
-    system_prompt="You are a summarizer agent. You will recieve company balance sheet and cash flow financial information. Your job is to create a brief summary for that information"
-)
+# Statement fetchers for speculative prefetch, keyed like their cached_statement entries.
+STATEMENT_FETCHERS = {
+    "balance_sheet": lambda symbol: get_balance_sheet(None, symbol),
+    "cash_flow": lambda symbol: get_cash_flow(None, symbol),
+}
+
+@registry.register("summarizer_agent")
+def build_summarizer_agent() -> Agent:
+    return Agent(
+        model=cached_model(hedged_model(get_model("gpt-4o"))),
+        name = "summarizer_agent",
+        system_prompt="You are a summarizer agent. You will recieve company balance sheet and cash flow financial information. Your job is to create a brief summary for that information"
+    )
 
 @dataclass
 class CompanyState :
@@ -123,7 +169,7 @@ class CashFlow((BaseNode[CompanyState])) :
     symbol : str
     async def run(self, ctx : GraphRunContext[CompanyState]) -> End[FinalResult] :
 
-        result = await cash_flow_agent.run(f"This is the symbol of the company {self.symbol}.")
+        result = await registry.get("cash_flow_agent").run(f"This is the symbol of the company {self.symbol}.")
         
             
         return End(result.output)
@@ -133,7 +179,7 @@ class BalanceSheet((BaseNode[CompanyState])) :
     symbol : str
     async def run(self, ctx : GraphRunContext[CompanyState]) -> End[FinalResult] :
         # with logfire.span("Fetch balance sheet"):
-        result = await balance_sheet_agent.run(f"This is the symbol of the company {self.symbol}.")
+        result = await registry.get("balance_sheet_agent").run(f"This is the symbol of the company {self.symbol}.")
         return End(FinalResult(response = result.output))
     
 
@@ -142,22 +188,53 @@ class BalanceSheet((BaseNode[CompanyState])) :
         
 @dataclass
 class Summarizer(BaseNode[CompanyState]) : 
-    balance_sheet_info : str
-    cash_flow_info : str
+    balance_sheet : StatementFigures | None
+    cash_flow : StatementFigures | None
+    errors : list[BranchError | str] = field(default_factory=list)
     async def run(self, ctx : GraphRunContext[CompanyState]) -> End[FinalResult] :
-        result = await summarizer_agent.run(f"The balance sheet is{self.balance_sheet_info} and the cash flow is {self.cash_flow_info}")
+        # Compact key=value lines instead of repr'd agent results keep the prompt, and its latency, small.
+        # Ratios are computed locally so the model reports them instead of working them out.
+        metrics = metrics_record(self.balance_sheet, self.cash_flow)
+        handoff = handoff_serializer.render([self.balance_sheet, self.cash_flow, metrics], self.errors)
+        prompt = f"Figures (K/M/B/T = thousand/million/billion/trillion):\n{handoff}"
+        if self.errors:
+            prompt += "\nSay briefly which data could not be fetched."
+        start = time.perf_counter()
+        result = await registry.get("summarizer_agent").run(prompt)
+        elapsed = time.perf_counter() - start
+
+        raw_tokens = estimate_tokens(json.dumps([asdict(r) for r in (self.balance_sheet, self.cash_flow) if r]))
+        handoff_tokens.observe(estimate_tokens(handoff), handoff="compact")
+        handoff_tokens.observe(raw_tokens, handoff="json")
+        logger.info(
+            f"Summarizer: {result.usage().input_tokens} input tokens, hand-off ~{estimate_tokens(handoff)} tokens "
+            f"(~{raw_tokens} as JSON), {elapsed:.2f}s"
+        )
         return End(FinalResult(response = result.output))
 
 
 @dataclass 
-class BalanceSheetAndCashflow(BaseNode[CompanyState]) :
+class BalanceSheetAndCashflow(FanOutNode[CompanyState]) :
     symbol : str
+
+    def branches(self, ctx : GraphRunContext[CompanyState]) -> list[Branch] :
+        prompt = f"This is the symbol of the company {self.symbol}."
+        return [
+            Branch("balance_sheet", lambda: registry.get("balance_sheet_agent").run(prompt)),
+            Branch("cash_flow", lambda: registry.get("cash_flow_agent").run(prompt)),
+        ]
+
+    def next_node(self, ctx : GraphRunContext[CompanyState], outcome : FanOutResult) -> Summarizer :
+        # A failed or slow branch is reported to the summarizer instead of failing the graph.
+        records = {
+            name: StatementFigures.from_agent_result(outcome.get(name), name) for name in ("balance_sheet", "cash_flow")
+        }
+        errors : list[BranchError | str] = list(outcome.errors.values())
+        errors += [f"{name}: no figures returned" for name, record in records.items() if record is None and name not in outcome.errors]
+        return Summarizer(records["balance_sheet"], records["cash_flow"], errors)
+
     async def run(self, ctx : GraphRunContext[CompanyState]) -> Summarizer :
-        balance_sheet, cashflow = await asyncio.gather(
-                balance_sheet_agent.run(f"This is the symbol of the company {self.symbol}."),
-                cash_flow_agent.run(f"This is the symbol of the company {self.symbol}.")
-        )
-        return Summarizer(balance_sheet,cashflow)
+        return self.next_node(ctx, await self.fan_out(ctx))
 
 
 @dataclass
@@ -165,8 +242,22 @@ class CompanyNameResolver(BaseNode[CompanyState]) :
     async def run(self, ctx : GraphRunContext[CompanyState] ) -> BalanceSheetAndCashflow: 
         # with logfire.span("Company name resolver"):
 
-        result =  await company_name_provider_agent.run(ctx.state.user_query)
-        return BalanceSheetAndCashflow(result.output.symbol)
+        # Most queries name a known company, so try the local index before paying for an LLM call.
+        match = get_symbol_index().resolve_query(ctx.state.user_query)
+        if match and match.confident:
+            logger.info(f"Resolved {match.symbol} locally ({match.method}, score {match.score})")
+            return BalanceSheetAndCashflow(match.symbol)
+
+        # Optionally start fetching statements for the best local guess while the LLM resolves.
+        speculation = Speculation.start(match, STATEMENT_FETCHERS)
+        symbol = None
+        try:
+            result =  await registry.get("company_name_provider_agent").run(ctx.state.user_query)
+            symbol = result.output.symbol
+        finally:
+            if speculation is not None:
+                speculation.settle(symbol)
+        return BalanceSheetAndCashflow(symbol)
 
 async def main() :
     state = CompanyState(
@@ -176,7 +267,7 @@ async def main() :
 
     # result = await g.run(CompanyNameResolver(), state = state)
     async with g.iter(CompanyNameResolver(), state = state) as run :
-        async for node in run :
+        async for node in timed_nodes(run) :
             print("node-------->",node)
     print(run.result)
 
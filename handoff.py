@@ -0,0 +1,145 @@
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic_ai.messages import ToolReturnPart
+
+# Figures kept per statement, e.g. "balance_sheet:assets,liabilities;cash_flow:free_cash_flow"; unset keeps all.
+HANDOFF_FIELDS = os.getenv("HANDOFF_FIELDS", "")
+
+# "compact" renders 352755000000 as 352.8B; "full" keeps every digit.
+HANDOFF_NUMBER_FORMAT = os.getenv("HANDOFF_NUMBER_FORMAT", "compact")
+
+# Significant digits for compact numbers.
+HANDOFF_PRECISION = int(os.getenv("HANDOFF_PRECISION", "4"))
+
+_SUFFIXES = ((1e12, "T"), (1e9, "B"), (1e6, "M"), (1e3, "K"))
+
+
+# ============================================================================
+# Hand-off Records
+# ============================================================================
+
+@dataclass(slots=True, frozen=True)
+class StatementFigures:
+    """The numeric figures of one financial statement, as handed from a data node to the summarizer."""
+    statement: str
+    symbol: str = ""
+    figures: dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Any, statement: str = "") -> "StatementFigures | None":
+        """
+        Build a record from a tool or model payload, keeping only numeric leaves.
+
+        Nested keys are joined with ``.``; ``type`` and ``symbol`` become the
+        statement and symbol. Returns None for missing data and for
+        ``ToolError`` payloads.
+        """
+        if not isinstance(data, dict) or not data or "error" in data:
+            return None
+        figures: dict[str, float] = {}
+        _collect(data, "", figures)
+        if not figures:
+            return None
+        symbol = data.get("symbol")
+        return cls(
+            statement=str(data.get("type") or statement),
+            symbol=symbol if isinstance(symbol, str) else "",
+            figures=figures,
+        )
+
+    @classmethod
+    def from_agent_result(cls, result: Any, statement: str = "") -> "StatementFigures | None":
+        """Take the figures from the latest statement a data agent's tools returned, or from its output."""
+        if result is None:
+            return None
+        for message in reversed(result.new_messages()):
+            for part in reversed(getattr(message, "parts", [])):
+                if isinstance(part, ToolReturnPart):
+                    record = cls.from_dict(part.content, statement)
+                    if record is not None:
+                        return record
+        output = result.output
+        return cls.from_dict(getattr(output, "data", output), statement)
+
+
+def _collect(data: dict, prefix: str, figures: dict[str, float]) -> None:
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            _collect(value, f"{name}.", figures)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+            figures[name] = value
+
+
+# ============================================================================
+# Prompt Serializer
+# ============================================================================
+
+def parse_fields(spec: str) -> dict[str, tuple[str, ...]] | None:
+    """Parse ``"statement:field,field;statement:field"`` into a field selection."""
+    if not spec.strip():
+        return None
+    selection = {}
+    for entry in spec.split(";"):
+        statement, _, names = entry.partition(":")
+        selection[statement.strip()] = tuple(name.strip() for name in names.split(",") if name.strip())
+    return selection
+
+
+@dataclass(slots=True)
+class HandoffSerializer:
+    """
+    Renders hand-off records as terse ``key=value`` lines for the summarizer prompt.
+
+    One line per statement, numbers abbreviated, optional per-statement field
+    selection (statements not listed keep all their figures). Much cheaper in
+    tokens than ``repr`` of agent results or indented JSON.
+    """
+    fields: dict[str, tuple[str, ...]] | None = None
+    number_format: str = "compact"
+    precision: int = 4
+
+    def format_number(self, value: float) -> str:
+        if self.number_format == "full":
+            return str(int(value)) if float(value).is_integer() else repr(value)
+        magnitude = abs(value)
+        for scale, suffix in _SUFFIXES:
+            if magnitude >= scale:
+                return f"{value / scale:.{self.precision}g}{suffix}"
+        return f"{value:.{self.precision}g}"
+
+    def render_statement(self, record: StatementFigures) -> str:
+        selected = self.fields.get(record.statement) if self.fields else None
+        names = [name for name in selected if name in record.figures] if selected else list(record.figures)
+        values = " ".join(f"{name}={self.format_number(record.figures[name])}" for name in names)
+        label = f"{record.statement} {record.symbol}".strip()
+        return f"{label}: {values}"
+
+    def render(self, records: list[StatementFigures | None], errors: list[Any] = ()) -> str:
+        """
+        Render statements and fetch errors as prompt text.
+
+        Args:
+            records: Hand-off records; None entries (missing data) are skipped
+            errors: Branch errors or messages, listed on an ``unavailable`` line
+
+        Returns:
+            The prompt body, one line per statement
+        """
+        lines = [self.render_statement(record) for record in records if record is not None]
+        if errors:
+            lines.append("unavailable: " + "; ".join(map(str, errors)))
+        return "\n".join(lines)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) for reporting prompt sizes."""
+    return math.ceil(len(text) / 4)
+
+
+handoff_serializer = HandoffSerializer(
+    fields=parse_fields(HANDOFF_FIELDS), number_format=HANDOFF_NUMBER_FORMAT, precision=HANDOFF_PRECISION
+)
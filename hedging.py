@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models import Model, ModelRequestParameters
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+
+from metrics import registry as metrics_registry
+from model_registry import get_model
+
+logger = logging.getLogger(__name__)
+
+hedge_counter = metrics_registry.counter(
+    "model_hedge_events_total",
+    "Hedged model request events: hedged, primary_won, hedge_won, deadline_exceeded, fallback.",
+    ("model", "event"),
+)
+
+
+# ============================================================================
+# Hedged Model
+# ============================================================================
+
+class HedgedModel(WrapperModel):
+    """
+    Model wrapper that hedges slow requests and bounds them with a deadline.
+
+    Once ``min_samples`` successful requests have been seen, a request still
+    running after the ``hedge_percentile`` of recent latencies gets a
+    duplicate. Whichever answers first wins and the other is cancelled, so
+    roughly ``100 - hedge_percentile`` percent of requests are duplicated.
+    When ``deadline_seconds`` passes without an answer, outstanding requests
+    are cancelled and ``fallback`` (if any) is asked instead.
+
+    Streaming requests are passed through unhedged.
+    """
+
+    def __init__(
+        self,
+        wrapped: Model | str,
+        fallback: Model | None = None,
+        deadline_seconds: float | None = None,
+        hedge_percentile: float | None = 95.0,
+        min_samples: int = 20,
+        window: int = 200,
+    ):
+        super().__init__(wrapped)
+        self.fallback = fallback
+        self.deadline_seconds = deadline_seconds
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=window)
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait before hedging, or None while hedging is off or still warming up."""
+        if self.hedge_percentile is None or len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile / 100))
+        return ordered[index]
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        start = time.perf_counter()
+        hedge_at = self.hedge_delay()
+        deadline_at = self.deadline_seconds or None
+
+        def attempt(label: str) -> asyncio.Task:
+            task = asyncio.ensure_future(self.wrapped.request(messages, model_settings, model_request_parameters))
+            started[task] = (label, time.perf_counter())
+            return task
+
+        started: dict[asyncio.Task, tuple[str, float]] = {}
+        pending = {attempt("primary")}
+        try:
+            while pending:
+                elapsed = time.perf_counter() - start
+                wakeups = [at - elapsed for at in (hedge_at, deadline_at) if at is not None]
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(min(wakeups), 0) if wakeups else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    label, task_start = started[winner]
+                    self._latencies.append(time.perf_counter() - task_start)
+                    if len(started) > 1:
+                        hedge_counter.inc(model=self.model_name, event=f"{label}_won")
+                    return winner.result()
+                if done and not pending:
+                    raise next(iter(done)).exception()
+
+                elapsed = time.perf_counter() - start
+                if hedge_at is not None and elapsed >= hedge_at:
+                    hedge_at = None
+                    pending.add(attempt("hedge"))
+                    hedge_counter.inc(model=self.model_name, event="hedged")
+                    logger.info(f"Hedging {self.model_name} request after {elapsed:.2f}s")
+                if deadline_at is not None and elapsed >= deadline_at:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        hedge_counter.inc(model=self.model_name, event="deadline_exceeded")
+        if self.fallback is None:
+            raise TimeoutError(f"{self.model_name} did not respond within {self.deadline_seconds:g}s")
+        hedge_counter.inc(model=self.model_name, event="fallback")
+        logger.warning(f"{self.model_name} missed its {self.deadline_seconds:g}s deadline, falling back to {self.fallback.model_name}")
+        return await self.fallback.request(messages, model_settings, model_request_parameters)
+
+
+def hedged_model(model: Model) -> Model:
+    """
+    Wrap ``model`` in a HedgedModel when ``MODEL_HEDGING`` is enabled.
+
+    Configured by ``MODEL_HEDGE_PERCENTILE`` (default 95), ``MODEL_HEDGE_MIN_SAMPLES``
+    (20), ``MODEL_DEADLINE_SECONDS`` (0 = no deadline) and ``MODEL_FALLBACK``
+    (a model name such as ``gpt-4o-mini``, unset = no fallback).
+    """
+    if os.getenv("MODEL_HEDGING", "0").lower() not in ("1", "true", "yes"):
+        return model
+    fallback_name = os.getenv("MODEL_FALLBACK")
+    return HedgedModel(
+        model,
+        fallback=get_model(fallback_name) if fallback_name else None,
+        deadline_seconds=float(os.getenv("MODEL_DEADLINE_SECONDS", "0")) or None,
+        hedge_percentile=float(os.getenv("MODEL_HEDGE_PERCENTILE", "95")),
+        min_samples=int(os.getenv("MODEL_HEDGE_MIN_SAMPLES", "20")),
+    )
@@ -0,0 +1,161 @@
+import logging
+import os
+import pickle
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from metrics import registry as metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Routes at or above this confidence skip the LLM planner.
+MIN_CONFIDENCE = float(os.getenv("INTENT_ROUTER_MIN_CONFIDENCE", "0.8"))
+
+# Which data tools each intent needs; "llm" means let main_agent decide.
+INTENT_TOOLS = {
+    "balance_sheet": ("get_balance_sheet",),
+    "cash_flow": ("get_cash_flow",),
+    "both": ("get_balance_sheet", "get_cash_flow"),
+    "llm": (),
+}
+
+route_counter = metrics_registry.counter(
+    "intent_routes_total", "Queries routed by the intent router.", ("intent", "router")
+)
+route_duration = metrics_registry.histogram(
+    "intent_route_duration_seconds", "Time spent classifying a query.", ("router",),
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01),
+)
+
+
+# ============================================================================
+# Routes and Classifiers
+# ============================================================================
+
+@dataclass(frozen=True)
+class Route:
+    """Outcome of routing one query."""
+    intent: str
+    confidence: float
+    router: str
+    tools: tuple[str, ...] = field(default=())
+
+    @property
+    def confident(self) -> bool:
+        return self.intent != "llm" and self.confidence >= MIN_CONFIDENCE
+
+    def as_dict(self) -> dict:
+        return {"intent": self.intent, "confidence": self.confidence, "router": self.router, "tools": list(self.tools)}
+
+
+class IntentClassifier(Protocol):
+    """Anything that can map a query to an intent with a confidence."""
+
+    name: str
+
+    def classify(self, query: str) -> Route: ...
+
+
+class RuleClassifier:
+    """
+    Keyword/regex classifier for the common, unambiguous queries.
+
+    A query naming balance sheet or cash flow terms routes with high
+    confidence, unless it also asks for reasoning (why, compare, explain...),
+    which the LLM planner handles better.
+    """
+
+    name = "rules"
+
+    BALANCE_SHEET = re.compile(r"\bbalance[\s-]*sheets?\b|\bassets?\b|\bliabilit(?:y|ies)\b", re.IGNORECASE)
+    CASH_FLOW = re.compile(r"\bcash[\s-]*flows?\b|\bfcf\b|\bfree cash\b|\boperating cash\b", re.IGNORECASE)
+    REASONING = re.compile(
+        r"\b(?:why|how come|compare|comparison|explain|trend|forecast|predict|should|recommend|versus|vs)\b",
+        re.IGNORECASE,
+    )
+
+    def classify(self, query: str) -> Route:
+        balance = bool(self.BALANCE_SHEET.search(query))
+        cash_flow = bool(self.CASH_FLOW.search(query))
+        if balance and cash_flow:
+            intent = "both"
+        elif balance:
+            intent = "balance_sheet"
+        elif cash_flow:
+            intent = "cash_flow"
+        else:
+            return Route("llm", 0.0, self.name)
+        confidence = 0.5 if self.REASONING.search(query) else 0.95
+        return Route(intent, confidence, self.name, INTENT_TOOLS[intent])
+
+
+class SklearnClassifier:
+    """
+    Wraps a pickled scikit-learn style pipeline exposing ``predict_proba`` and ``classes_``.
+
+    The pipeline must accept raw query strings (e.g. a TfidfVectorizer in front
+    of a linear model) and use the keys of ``INTENT_TOOLS`` as class labels.
+    """
+
+    name = "model"
+
+    def __init__(self, model: Any):
+        self.model = model
+        self.classes = [str(label) for label in model.classes_]
+
+    @classmethod
+    def from_file(cls, path: str) -> "SklearnClassifier":
+        with open(path, "rb") as f:
+            model = pickle.load(f)
+        logger.info(f"Loaded intent model from {path} with classes {list(model.classes_)}")
+        return cls(model)
+
+    def classify(self, query: str) -> Route:
+        probabilities = self.model.predict_proba([query])[0]
+        best = max(range(len(probabilities)), key=probabilities.__getitem__)
+        intent = self.classes[best]
+        if intent not in INTENT_TOOLS:
+            return Route("llm", 0.0, self.name)
+        return Route(intent, float(probabilities[best]), self.name, INTENT_TOOLS[intent])
+
+
+# ============================================================================
+# Router
+# ============================================================================
+
+class IntentRouter:
+    """
+    Tries each classifier in order and returns the first confident route.
+
+    When none is confident the query goes to the LLM planner; the route then
+    records which classifier came closest, for diagnostics.
+    """
+
+    def __init__(self, classifiers: list[IntentClassifier]):
+        self.classifiers = classifiers
+
+    def route(self, query: str) -> Route:
+        start = time.perf_counter()
+        best = Route("llm", 0.0, "fallback")
+        for classifier in self.classifiers:
+            candidate = classifier.classify(query)
+            if candidate.confident:
+                best = candidate
+                break
+            if candidate.confidence > best.confidence:
+                best = candidate
+        route = best if best.confident else Route("llm", best.confidence, "fallback")
+        route_duration.observe(time.perf_counter() - start, router=route.router)
+        route_counter.inc(intent=route.intent, router=route.router)
+        return route
+
+
+def build_intent_router() -> IntentRouter:
+    """Rules first, then the optional on-disk model named by ``INTENT_MODEL_PATH``."""
+    classifiers: list[IntentClassifier] = [RuleClassifier()]
+    model_path = os.getenv("INTENT_MODEL_PATH")
+    if model_path:
+        classifiers.append(SklearnClassifier.from_file(model_path))
+    return IntentRouter(classifiers)
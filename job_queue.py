@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from metrics import registry as metrics_registry
+
+logger = logging.getLogger(__name__)
+
+job_counter = metrics_registry.counter(
+    "jobs_total",
+    "Background jobs by outcome: submitted, rejected, succeeded, failed, expired.",
+    ("outcome",),
+)
+job_wait = metrics_registry.histogram(
+    "job_queue_wait_seconds", "Time jobs spent queued before a worker picked them up.", ()
+)
+
+
+class QueueFull(Exception):
+    """Raised by ``JobQueue.submit`` when the queue is at capacity."""
+
+
+# ============================================================================
+# Jobs
+# ============================================================================
+
+@dataclass
+class Job:
+    """One submitted unit of work and, once finished, its result or error."""
+    id: str
+    call: Callable[[], Awaitable[Any]] = field(repr=False)
+    status: str = "queued"  # queued, running, succeeded, failed
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: Any = None
+    error: str | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """
+    Bounded in-process job queue served by a pool of async workers.
+
+    ``submit`` returns immediately with a job ID and raises ``QueueFull``
+    when ``max_queued`` jobs are already waiting, so callers can shed load
+    (HTTP 429) instead of queueing without bound. Finished jobs are kept for
+    ``result_ttl_seconds`` for polling, then dropped.
+
+    Jobs live in this process only: they are lost on restart and a job ID
+    is only known to the worker process that accepted it.
+    """
+
+    def __init__(self, workers: int = 4, max_queued: int = 100, result_ttl_seconds: float = 600.0):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.result_ttl_seconds = result_ttl_seconds
+        self.jobs: dict[str, Job] = {}
+        self._queue: asyncio.Queue[Job] | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start the worker pool on the running event loop."""
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._tasks = [asyncio.create_task(self._worker(i), name=f"job-worker-{i}") for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._expire_loop(), name="job-expiry"))
+
+    async def stop(self) -> None:
+        """Cancel the workers; queued and running jobs are abandoned."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, call: Callable[[], Awaitable[Any]]) -> Job:
+        """
+        Queue ``call`` for a worker.
+
+        Args:
+            call: Zero-argument coroutine factory; its return value becomes the job result
+
+        Returns:
+            The queued Job
+
+        Raises:
+            QueueFull: When ``max_queued`` jobs are already waiting
+        """
+        if self._queue is None:
+            raise RuntimeError("JobQueue.start() has not been called")
+        job = Job(id=uuid.uuid4().hex, call=call)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            job_counter.inc(outcome="rejected")
+            raise QueueFull(f"{self.max_queued} jobs already queued") from None
+        self.jobs[job.id] = job
+        job_counter.inc(outcome="submitted")
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self.jobs.get(job_id)
+
+    def snapshot(self) -> dict:
+        """Return queue depth and job counts by status for reporting."""
+        statuses: dict[str, int] = {}
+        for job in self.jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "max_queued": self.max_queued,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "result_ttl_seconds": self.result_ttl_seconds,
+            "jobs": statuses,
+        }
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            job_wait.observe(job.started_at - job.submitted_at)
+            try:
+                job.result = await job.call()
+                job.status = "succeeded"
+            except Exception as e:
+                logger.error(f"Job {job.id} failed: {e}")
+                job.error = str(e)
+                job.status = "failed"
+            finally:
+                job.finished_at = time.time()
+                job.call = None  # drop the closure and whatever request it holds
+                self._queue.task_done()
+            job_counter.inc(outcome=job.status)
+
+    def expire(self) -> int:
+        """Drop finished jobs older than ``result_ttl_seconds``; returns how many were dropped."""
+        cutoff = time.time() - self.result_ttl_seconds
+        expired = [job_id for job_id, job in self.jobs.items() if job.done and job.finished_at < cutoff]
+        for job_id in expired:
+            del self.jobs[job_id]
+        if expired:
+            job_counter.inc(len(expired), outcome="expired")
+        return len(expired)
+
+    async def _expire_loop(self) -> None:
+        while True:
+            await asyncio.sleep(max(min(self.result_ttl_seconds / 4, 60.0), 1.0))
+            self.expire()
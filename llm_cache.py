@@ -0,0 +1,221 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+import pydantic_core
+from pydantic_ai.messages import ModelMessage, ModelMessagesTypeAdapter, ModelResponse
+from pydantic_ai.models import KnownModelName, Model, ModelRequestParameters
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+
+logger = logging.getLogger(__name__)
+
+# Fields that change on every run but don't influence what the model is asked.
+_VOLATILE_KEYS = frozenset({"timestamp", "run_id", "provider_response_id", "provider_details", "usage"})
+
+
+# ============================================================================
+# Cache Backends
+# ============================================================================
+
+class ResponseCacheBackend(Protocol):
+    """Storage for serialized model responses keyed by request fingerprint."""
+
+    async def get(self, key: str) -> str | None: ...
+
+    async def set(self, key: str, value: str) -> None: ...
+
+
+class InMemoryLRUBackend:
+    """Process-local backend bounded by entry count."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    async def get(self, key: str) -> str | None:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class SQLiteBackend:
+    """On-disk backend shared across processes and restarts."""
+
+    def __init__(self, path: str | Path = ".llm_cache.sqlite3"):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            self._conn.commit()
+
+    async def get(self, key: str) -> str | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self._set, key, value)
+
+
+# ============================================================================
+# Cached Model
+# ============================================================================
+
+@dataclass
+class ResponseCacheStats:
+    """Counters describing the effect of the response cache."""
+    hits: int = 0
+    misses: int = 0
+    saved_latency_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in _VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_strip_volatile(v) for v in value]
+    return value
+
+
+class CachedModel(WrapperModel):
+    """
+    Model wrapper that answers byte-identical requests from a cache.
+
+    The key covers the model name, the full message history (system prompt,
+    instructions and user prompt included), tool and output definitions and
+    model settings. Hits skip the provider request entirely. Streaming
+    requests are passed through uncached.
+    """
+
+    def __init__(self, wrapped: Model | KnownModelName, backend: ResponseCacheBackend, stats: ResponseCacheStats | None = None):
+        super().__init__(wrapped)
+        self.backend = backend
+        self.stats = stats or ResponseCacheStats()
+
+    def cache_key(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> str:
+        """Fingerprint a request, ignoring timestamps and run ids."""
+        payload = {
+            "model": f"{self.system}:{self.model_name}",
+            "messages": _strip_volatile(ModelMessagesTypeAdapter.dump_python(messages, mode="json")),
+            "parameters": pydantic_core.to_jsonable_python(model_request_parameters, fallback=repr),
+            "settings": pydantic_core.to_jsonable_python(model_settings or {}, fallback=repr),
+        }
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        key = self.cache_key(messages, model_settings, model_request_parameters)
+        cached = await self.backend.get(key)
+        if cached is not None:
+            entry = json.loads(cached)
+            self.stats.hits += 1
+            self.stats.saved_latency_seconds += entry["latency"]
+            logger.info(f"LLM cache hit for {self.model_name} (saved {entry['latency']:.2f}s)")
+            return ModelMessagesTypeAdapter.validate_python(entry["response"])[0]
+
+        self.stats.misses += 1
+        start = time.perf_counter()
+        response = await super().request(messages, model_settings, model_request_parameters)
+        latency = time.perf_counter() - start
+        await self.backend.set(key, json.dumps({
+            "latency": latency,
+            "response": ModelMessagesTypeAdapter.dump_python([response], mode="json"),
+        }))
+        return response
+
+
+# ============================================================================
+# Opt-in Configuration
+# ============================================================================
+
+response_cache_stats = ResponseCacheStats()
+_backend: ResponseCacheBackend | None = None
+
+
+def get_response_cache_backend() -> ResponseCacheBackend | None:
+    """
+    Return the backend selected by ``LLM_RESPONSE_CACHE``.
+
+    ``memory`` uses an in-process LRU (``LLM_RESPONSE_CACHE_MAX_ENTRIES``),
+    ``sqlite`` a file at ``LLM_RESPONSE_CACHE_PATH``; unset disables caching.
+    """
+    global _backend
+    if _backend is None:
+        kind = os.getenv("LLM_RESPONSE_CACHE", "").lower()
+        if kind == "memory":
+            _backend = InMemoryLRUBackend(int(os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", "512")))
+        elif kind == "sqlite":
+            _backend = SQLiteBackend(os.getenv("LLM_RESPONSE_CACHE_PATH", ".llm_cache.sqlite3"))
+    return _backend
+
+
+def cached_model(model: Model) -> Model:
+    """
+    Wrap ``model`` in a CachedModel when response caching is enabled.
+
+    Args:
+        model: Model instance to cache, typically from ``get_model``
+
+    Returns:
+        A CachedModel around ``model``, or ``model`` itself when
+        ``LLM_RESPONSE_CACHE`` is unset
+    """
+    backend = get_response_cache_backend()
+    if backend is None:
+        return model
+    return CachedModel(model, backend, response_cache_stats)
+
+
+def response_cache_snapshot() -> dict:
+    """Return hit rate and saved latency for reporting."""
+    return {
+        "enabled": get_response_cache_backend() is not None,
+        "hit_rate": round(response_cache_stats.hit_rate, 4),
+        **asdict(response_cache_stats),
+    }
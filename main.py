@@ -1,17 +1,66 @@
 import asyncio
+import functools
+import json
 import os
 import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from pydantic_ai import Agent, ModelSettings, RunContext
+from pydantic_ai import Agent, AgentRunResultEvent, ModelSettings, RunContext
+from pydantic_ai.messages import (
+    FunctionToolCallEvent,
+    FunctionToolResultEvent,
+    PartDeltaEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+    ToolReturnPart,
+)
 from pydantic_ai.tools import Tool
 import logging
+from agent_registry import AgentRegistry
+from fanout import Branch, fan_out
+from financial_metrics import build_frame, compute_metrics
+from hedging import hedged_model
+from intent_router import Route, build_intent_router
+from job_queue import JobQueue, QueueFull
+from llm_cache import response_cache_snapshot
+from metrics import render_prometheus, timed_tool
+from model_registry import close_http_clients, get_model
+from statement_store import lookup_statement
+from tool_cache import AsyncTTLCache, cached_statement, financial_data_cache
+from tool_resilience import circuit_snapshot, resilient_tool
 
 load_dotenv()
 
-key = os.getenv("OPENAI_API_KEY")
-print("key", key)
+# Upper bound on concurrent agent runs per batch call; a request may ask for less.
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+
+# "delegate" hands data fetches to the sub-agents in agents.py; "direct" gives
+# main_agent the data tools itself.
+MAIN_AGENT_TOOL_MODE = os.getenv("MAIN_AGENT_TOOL_MODE", "delegate")
+
+# Classify queries locally and, when the tools to run are obvious, fetch them
+# directly and make a single answer call instead of running main_agent.
+INTENT_ROUTER_ENABLED = os.getenv("INTENT_ROUTER_ENABLED", "1").lower() not in ("0", "false", "no")
+
+# Identical concurrent /run-agent requests share one agent run; a positive
+# retention also serves the finished response to repeats for that long.
+RUN_AGENT_COALESCING = os.getenv("RUN_AGENT_COALESCING", "1").lower() not in ("0", "false", "no")
+RUN_AGENT_RESULT_TTL_SECONDS = float(os.getenv("RUN_AGENT_RESULT_TTL_SECONDS", "0"))
+
+# Async job mode: concurrent agent runs, jobs allowed to wait before POST /jobs
+# answers 429, and how long finished results stay fetchable.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "8"))
+JOB_QUEUE_MAX = int(os.getenv("JOB_QUEUE_MAX", "100"))
+JOB_RESULT_TTL_SECONDS = float(os.getenv("JOB_RESULT_TTL_SECONDS", "600"))
+
+# Most statement fetches in flight for one /financial-metrics call.
+FINANCIAL_METRICS_CONCURRENCY = int(os.getenv("FINANCIAL_METRICS_CONCURRENCY", "32"))
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -32,10 +81,39 @@ class AgentResponse(BaseModel):
     result: dict
 
 
+class BatchRequest(BaseModel):
+    """Request model for the batch agent endpoint."""
+    items: list[AgentRequest]
+    concurrency: int | None = None
+    stream: bool = False
+
+
+class MetricsRequest(BaseModel):
+    """Request model for the metrics-only endpoint."""
+    symbols: list[str]
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of a single item within a batch."""
+    index: int
+    status: str
+    response: AgentResponse | None = None
+    error: str | None = None
+
+
+class BatchResponse(BaseModel):
+    """Response model for the batch agent endpoint."""
+    status: str
+    results: list[BatchItemResult]
+
+
 # ============================================================================
 # Tool Definitions (Three Basic Tools)
 # ============================================================================
 
+@timed_tool
+@resilient_tool("balance_sheet")
+@cached_statement("balance_sheet")
 async def get_balance_sheet(symbol: str) -> dict:
     """
     Fetch balance sheet data for a given company symbol.
@@ -46,6 +124,9 @@ async def get_balance_sheet(symbol: str) -> dict:
     Returns:
         Dictionary containing balance sheet data
     """
+    stored = lookup_statement("balance_sheet", symbol)
+    if stored is not None:
+        return stored
     start = time.time()
     logger.info(f"🚀 Started balance sheet for {symbol} at {start:.2f}")
     logger.info(f"Fetching balance sheet for {symbol}")
@@ -60,6 +141,9 @@ async def get_balance_sheet(symbol: str) -> dict:
     }
 
 
+@timed_tool
+@resilient_tool("cash_flow")
+@cached_statement("cash_flow")
 async def get_cash_flow(symbol: str) -> dict:
     """
     Fetch cash flow data for a given company symbol.
@@ -70,6 +154,9 @@ async def get_cash_flow(symbol: str) -> dict:
     Returns:
         Dictionary containing cash flow data
     """
+    stored = lookup_statement("cash_flow", symbol)
+    if stored is not None:
+        return stored
     start = time.time()
     logger.info(f"🚀 Started cash flow for {symbol} at {start:.2f}")
     logger.info(f"Fetching cash flow for {symbol}")
@@ -90,24 +177,24 @@ async def get_cash_flow(symbol: str) -> dict:
 # Parallel Wrapper Tool 
 # ============================================================================
 
-async def get_all_data_parallel(symbol: str, query: str) -> dict:
+@timed_tool
+async def get_all_data_parallel(symbol: str) -> dict:
     """
-    Fetch all financial data and news in parallel using asyncio.gather.
+    Fetch balance sheet and cash flow data in parallel using asyncio.gather.
     
     This tool demonstrates parallel execution of multiple async operations,
     which is more efficient than calling them sequentially.
     
     Args:
         symbol: Company ticker symbol
-        query: News search query
         
     Returns:
         Dictionary containing all data from parallel calls
     """
-    logger.info(f"Fetching all data in parallel for {symbol} with query: {query}")
+    logger.info(f"Fetching all data in parallel for {symbol}")
     
-    # Execute all three tools in parallel
-    balance, cash_flow, news = await asyncio.gather(
+    # Execute both tools in parallel
+    balance, cash_flow = await asyncio.gather(
         get_balance_sheet(symbol),
         get_cash_flow(symbol),
     )
@@ -115,7 +202,6 @@ async def get_all_data_parallel(symbol: str, query: str) -> dict:
     return {
         "balance_sheet": balance,
         "cash_flow": cash_flow,
-        "news": news,
         "parallel_execution": True,
     }
 
@@ -124,18 +210,53 @@ async def get_all_data_parallel(symbol: str, query: str) -> dict:
 # PydanticAI Agent Setup
 # ============================================================================
 
-# Create agent with parallel tool calls enabled
-from agents import cash_flow_agent, balance_sheet_agent
+import agents
 
-main_agent = Agent("gpt-4o", model_settings=ModelSettings(parallel_tool_calls=True))
+# Agents are built on first request rather than at import to keep worker boot fast.
+registry = AgentRegistry()
+__getattr__ = registry.module_getattr(__name__)
 
-@main_agent.tool
+# Create agent with parallel tool calls enabled
+@registry.register("main_agent")
+def build_main_agent() -> Agent:
+    agent = Agent(hedged_model(get_model("gpt-4o")), model_settings=ModelSettings(parallel_tool_calls=True))
+    if MAIN_AGENT_TOOL_MODE == "direct":
+        # The data tools are deterministic, so exposing them directly saves the
+        # sub-agent model round trips: one planning call plus one answer call.
+        agent.tool_plain(get_balance_sheet)
+        agent.tool_plain(get_cash_flow)
+        agent.tool_plain(get_all_data_parallel)
+    else:
+        agent.tool(delegate_balance)
+        agent.tool(delegate_cashflow)
+    return agent
+
+
+@registry.register("answer_agent")
+def build_answer_agent() -> Agent:
+    # No tools: answers a query from data the intent router already fetched.
+    return Agent(hedged_model(get_model("gpt-4o")))
+
+@timed_tool
 async def delegate_balance(ctx: RunContext[None], symbol: str):
-    return await balance_sheet_agent.run(f"Get balance sheet for {symbol}")
+    return await agents.registry.get("balance_sheet_agent").run(f"Get balance sheet for {symbol}")
 
-@main_agent.tool
+@timed_tool
 async def delegate_cashflow(ctx: RunContext[None], symbol: str):
-    return await cash_flow_agent.run(f"Get cash flow for {symbol}")
+    return await agents.registry.get("cash_flow_agent").run(f"Get cash flow for {symbol}")
+
+
+# ============================================================================
+# Intent Routing
+# ============================================================================
+
+intent_router = build_intent_router() if INTENT_ROUTER_ENABLED else None
+
+# Tools the router may run without going through main_agent.
+ROUTED_TOOLS = {
+    "get_balance_sheet": get_balance_sheet,
+    "get_cash_flow": get_cash_flow,
+}
 
 
 
@@ -143,7 +264,19 @@ async def delegate_cashflow(ctx: RunContext[None], symbol: str):
 # FastAPI Application
 # ============================================================================
 
-app = FastAPI(title="PydanticAI Parallel Agent", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the job workers, and release pooled model HTTP connections when the server shuts down."""
+    job_queue.start()
+    yield
+    await job_queue.stop()
+    await close_http_clients()
+
+
+job_queue = JobQueue(workers=JOB_WORKERS, max_queued=JOB_QUEUE_MAX, result_ttl_seconds=JOB_RESULT_TTL_SECONDS)
+
+
+app = FastAPI(title="PydanticAI Parallel Agent", version="1.0.0", lifespan=lifespan)
 
 
 @app.get("/health")
@@ -152,6 +285,166 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus metrics for graph nodes, agent runs, model requests and tool calls."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters for the financial data, LLM response and /run-agent coalescing caches."""
+    run_agent = run_agent_results.snapshot()
+    return {
+        "financial_data": financial_data_cache.snapshot(),
+        "llm_response": response_cache_snapshot(),
+        # Every coalesced or retained request is an agent run (and its model calls) not made.
+        "run_agent": {**run_agent, "saved_runs": run_agent["hits"] + run_agent["coalesced"]},
+    }
+
+
+@app.get("/circuits")
+async def circuit_states():
+    """State of the per-upstream circuit breakers guarding the data tools."""
+    return {"circuits": circuit_snapshot()}
+
+
+def build_agent_instructions(company: str) -> str:
+    """Build the run instructions shared by the blocking and streaming endpoints."""
+    return f"""
+        You are a financial data retrieval agent.
+
+        Your task:
+        - Get the balance sheet data for {company} or the cash flow data for {company} according to the user query.
+
+        Rules:
+        - Use the provided tool as needed.
+        """
+
+
+async def execute_route(request: AgentRequest, route: Route) -> AgentResponse:
+    """
+    Run the tools picked by the intent router concurrently, then answer with one LLM call.
+
+    Skips main_agent's planning call (and, in delegate mode, the sub-agents'
+    calls) while keeping the response a model answer like ``execute_agent``'s.
+
+    Args:
+        request: AgentRequest containing company symbol and query
+        route: Confident route from the intent router
+
+    Returns:
+        AgentResponse with the model's answer, plus each tool's data keyed by tool name
+    """
+    logger.info(f"Intent router picked {route.intent} ({route.router}, confidence {route.confidence:.2f})")
+    results = await asyncio.gather(*(ROUTED_TOOLS[name](request.company) for name in route.tools))
+    tool_results = dict(zip(route.tools, results))
+    result = await registry.get("answer_agent").run(
+        user_prompt=request.query,
+        instructions=f"""
+        You are a financial data retrieval agent.
+
+        Answer the user query about {request.company} using only this data:
+        {json.dumps(tool_results, default=str)}
+        """,
+    )
+    return AgentResponse(
+        status="success",
+        result={
+            "company": request.company,
+            "query": request.query,
+            "agent_response": result.output,
+            "tool_results": tool_results,
+            "parallel_execution": len(route.tools) > 1,
+            "route": route.as_dict(),
+        }
+    )
+
+
+def format_sse(event: str, data: dict) -> str:
+    """Encode a single Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def execute_agent(request: AgentRequest) -> AgentResponse:
+    """
+    Run the main agent for a single request.
+
+    Shared by ``/run-agent`` and ``/run-agent/batch``; exceptions propagate so
+    each caller can decide how to report them.
+    """
+    # logger.info(f"Received request: company={request.company}, query={request.query}")
+    
+    # Construct prompt for the agent
+    prompt = build_agent_instructions(request.company)
+
+    
+    route = intent_router.route(request.query) if intent_router is not None else None
+    if route is not None and route.confident:
+        return await execute_route(request, route)
+
+    # Run the agent
+    logger.info("Running agent with parallel tool calls enabled")
+    # Run the agent
+    result = await registry.get("main_agent").run(user_prompt=request.query,instructions=prompt)
+
+    # # Inspect intermediate steps
+    # for message in result.new_messages():
+    #     print(f"DEBUG: {message}") 
+
+    # Specifically looking for tool calls
+    for message in result.new_messages():
+        logger.info("-----------------intermediatery call of the llm-----------------")
+        if hasattr(message, 'parts'):
+            for part in message.parts:
+                if part.part_kind == 'tool-call':
+                    logger.info(f"Tool Called: {part.tool_name} with args: {part.args}")
+                elif part.part_kind == 'tool-return':
+                    logger.info(f"Tool Result: {part.content}")  
+                elif part.part_kind == "text"  :
+                    logger.info(f"Text Result: {part.content}")   
+                else : 
+                    logger.info(f"Reslut contains none of these types actual type is: {part.part_kind}")   
+
+        logger.info("-----------------intermediatery call of the llm end")
+    logger.info("Agent execution completed successfully")
+    
+    
+    
+    return AgentResponse(
+        status="success",
+        result={
+            "company": request.company,
+            "query": request.query,
+            "agent_response": result.output,
+            "parallel_execution": True,
+            "route": route.as_dict() if route is not None else None,
+        }
+    )
+
+
+run_agent_results = AsyncTTLCache(ttl_seconds=RUN_AGENT_RESULT_TTL_SECONDS, max_entries=1024, name="run_agent")
+
+
+def request_key(request: AgentRequest) -> tuple[str, str]:
+    """Normalize a request so trivially different duplicates share a key."""
+    return request.company.strip().upper(), " ".join(request.query.lower().split())
+
+
+async def execute_agent_coalesced(request: AgentRequest) -> AgentResponse:
+    """
+    ``execute_agent``, with identical concurrent requests sharing one run.
+
+    Duplicates arriving while a run is in flight await it and get the same
+    response (and the same error if it fails); with
+    ``RUN_AGENT_RESULT_TTL_SECONDS`` > 0 the response is also served to
+    repeats for that long. ``/cache/stats`` reports the runs saved.
+    """
+    if not RUN_AGENT_COALESCING:
+        return await execute_agent(request)
+    return await run_agent_results.get_or_fetch(request_key(request), lambda: execute_agent(request))
+
+
 @app.post("/run-agent", response_model=AgentResponse)
 async def run_agent(request: AgentRequest) -> AgentResponse:
     """
@@ -167,62 +460,214 @@ async def run_agent(request: AgentRequest) -> AgentResponse:
         HTTPException: If agent execution fails
     """
     try:
-        # logger.info(f"Received request: company={request.company}, query={request.query}")
-        
-        # Construct prompt for the agent
-        prompt = f"""
-        You are a financial data retrieval agent.
+        return await execute_agent_coalesced(request)
+    except Exception as e:
+        logger.error(f"Error running agent: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Agent execution failed: {str(e)}")
 
-        Your task:
-        - Get the balance sheet data for {request.company} or the cash flow data for {request.company} according to the user query.
 
-        Rules:
-        - Use the provided tool as needed.
-        """
+async def run_batch_item(index: int, request: AgentRequest, semaphore: asyncio.Semaphore) -> BatchItemResult:
+    """Run one batch item under the shared semaphore, capturing failures per item."""
+    async with semaphore:
+        try:
+            response = await execute_agent_coalesced(request)
+            return BatchItemResult(index=index, status="success", response=response)
+        except Exception as e:
+            logger.error(f"Error running batch item {index} ({request.company}): {str(e)}")
+            return BatchItemResult(index=index, status="error", error=f"Agent execution failed: {str(e)}")
 
-        
-        # Run the agent
-        logger.info("Running agent with parallel tool calls enabled")
-        # Run the agent
-        result = await main_agent.run(user_prompt=request.query,instructions=prompt)
-
-        # # Inspect intermediate steps
-        # for message in result.new_messages():
-        #     print(f"DEBUG: {message}") 
-
-        # Specifically looking for tool calls
-        for message in result.new_messages():
-            logger.info("-----------------intermediatery call of the llm-----------------")
-            if hasattr(message, 'parts'):
-                for part in message.parts:
-                    if part.part_kind == 'tool-call':
-                        logger.info(f"Tool Called: {part.tool_name} with args: {part.args}")
-                    elif part.part_kind == 'tool-return':
-                        logger.info(f"Tool Result: {part.content}")  
-                    elif part.part_kind == "text"  :
-                        logger.info(f"Text Result: {part.content}")   
-                    else : 
-                        logger.info(f"Reslut contains none of these types actual type is: {part.part_kind}")   
-
-            logger.info("-----------------intermediatery call of the llm end")
-        logger.info("Agent execution completed successfully")
-        
-        
-        
-        return AgentResponse(
-            status="success",
-            result={
-                "company": request.company,
-                "query": request.query,
-                "agent_response": result.data if hasattr(result, 'data') else str(result),
-                "parallel_execution": True,
-            }
-        )
-    
+
+async def stream_batch_results(tasks: list[asyncio.Task]) -> AsyncIterator[str]:
+    """Yield each batch item as an NDJSON line in completion order."""
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            item = await next_done
+            yield item.model_dump_json() + "\n"
+    finally:
+        # Client went away mid-stream: don't keep burning model calls.
+        for task in tasks:
+            task.cancel()
+
+
+@app.post("/run-agent/batch", response_model=None)
+async def run_agent_batch(request: BatchRequest) -> BatchResponse | StreamingResponse:
+    """
+    Run the agent for many requests concurrently with bounded parallelism.
+
+    At most ``concurrency`` items (capped at ``BATCH_MAX_CONCURRENCY``) run at
+    once. Failures are reported per item and never fail the whole batch.
+
+    Args:
+        request: BatchRequest containing the items and execution options
+
+    Returns:
+        BatchResponse with results in input order, or an ``application/x-ndjson``
+        stream emitting one BatchItemResult per line as each item finishes
+    """
+    concurrency = max(1, min(request.concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY))
+    semaphore = asyncio.Semaphore(concurrency)
+    logger.info(f"Running batch of {len(request.items)} items with concurrency {concurrency}")
+    tasks = [
+        asyncio.create_task(run_batch_item(index, item, semaphore))
+        for index, item in enumerate(request.items)
+    ]
+
+    if request.stream:
+        return StreamingResponse(stream_batch_results(tasks), media_type="application/x-ndjson")
+
+    results = await asyncio.gather(*tasks)
+    failed = sum(1 for item in results if item.status != "success")
+    return BatchResponse(
+        status="success" if failed == 0 else "partial" if failed < len(results) else "error",
+        results=list(results),
+    )
+
+
+async def stream_agent_events(request: AgentRequest) -> AsyncIterator[str]:
+    """
+    Run the main agent and yield its progress as Server-Sent Events.
+
+    Emits ``tool_call``, ``tool_return`` and ``text_delta`` events as soon as
+    pydantic-ai produces them, followed by a final ``result`` event carrying
+    the same payload as ``/run-agent``, or an ``error`` event on failure.
+    """
+    prompt = build_agent_instructions(request.company)
+    try:
+        async for event in registry.get("main_agent").run_stream_events(user_prompt=request.query, instructions=prompt):
+            if isinstance(event, FunctionToolCallEvent):
+                logger.info(f"Tool Called: {event.part.tool_name} with args: {event.part.args}")
+                yield format_sse("tool_call", {
+                    "tool_call_id": event.part.tool_call_id,
+                    "tool_name": event.part.tool_name,
+                    "args": event.part.args_as_dict(),
+                })
+            elif isinstance(event, FunctionToolResultEvent):
+                if isinstance(event.result, ToolReturnPart):
+                    content = event.result.model_response_str()
+                else:
+                    content = event.result.model_response()
+                yield format_sse("tool_return", {
+                    "tool_call_id": event.result.tool_call_id,
+                    "tool_name": event.result.tool_name,
+                    "content": content,
+                })
+            elif isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
+                if event.part.content:
+                    yield format_sse("text_delta", {"content": event.part.content})
+            elif isinstance(event, PartDeltaEvent) and isinstance(event.delta, TextPartDelta):
+                yield format_sse("text_delta", {"content": event.delta.content_delta})
+            elif isinstance(event, AgentRunResultEvent):
+                logger.info("Streaming agent execution completed successfully")
+                yield format_sse("result", AgentResponse(
+                    status="success",
+                    result={
+                        "company": request.company,
+                        "query": request.query,
+                        "agent_response": event.result.output,
+                        "parallel_execution": True,
+                    }
+                ).model_dump())
     except Exception as e:
-        logger.error(f"Error running agent: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Agent execution failed: {str(e)}")
-    
+        # Headers are already sent once streaming starts, so surface the failure in-band.
+        logger.error(f"Error streaming agent: {str(e)}")
+        yield format_sse("error", {"detail": f"Agent execution failed: {str(e)}"})
+
+
+@app.post("/run-agent/stream")
+async def run_agent_stream(request: AgentRequest) -> StreamingResponse:
+    """
+    Streaming variant of ``/run-agent`` using Server-Sent Events.
+
+    Args:
+        request: AgentRequest containing company symbol and query
+
+    Returns:
+        A ``text/event-stream`` response emitting tool calls, tool returns and
+        text deltas as the agent produces them
+    """
+    return StreamingResponse(
+        stream_agent_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: AgentRequest) -> dict:
+    """
+    Queue an agent run and return at once; poll ``GET /jobs/{id}`` for the result.
+
+    The connection is held only as long as it takes to enqueue, however long
+    the agent runs. Jobs are kept in this process, so polls must reach the
+    same worker.
+
+    Args:
+        request: AgentRequest containing company symbol and query
+
+    Returns:
+        The job ID and its status URL
+
+    Raises:
+        HTTPException: 429 when the job queue is full
+    """
+    async def run() -> dict:
+        return (await execute_agent_coalesced(request)).model_dump()
+
+    try:
+        job = job_queue.submit(run)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=f"Job queue full: {e}", headers={"Retry-After": "5"})
+    return {"id": job.id, "status": job.status, "url": f"/jobs/{job.id}"}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str) -> dict:
+    """
+    Status of a job, with its ``AgentResponse`` once succeeded or its error once failed.
+
+    Raises:
+        HTTPException: 404 for unknown jobs and jobs whose result has expired
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return job.as_dict()
+
+
+@app.get("/jobs")
+async def job_stats() -> dict:
+    """Queue depth and job counts by status."""
+    return job_queue.snapshot()
+
+
+@app.post("/financial-metrics")
+async def financial_metrics(request: MetricsRequest) -> dict:
+    """
+    Metrics-only mode: compute the standard ratio set for many symbols without any LLM call.
+
+    Statements are fetched through the cached data tools, then every ratio
+    is computed for all symbols in one vectorized pass.
+
+    Args:
+        request: MetricsRequest with the symbols to screen
+
+    Returns:
+        One row of ratios per symbol, plus the statements that could not be fetched
+    """
+    # Normalized and deduplicated, so a repeated symbol is fetched and reported once.
+    symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in request.symbols))
+    branches = [
+        Branch(f"{symbol}:{name}", functools.partial(tool, symbol))
+        for symbol in symbols
+        for name, tool in ROUTED_TOOLS.items()
+    ]
+    outcome = await fan_out(branches, max_concurrency=FINANCIAL_METRICS_CONCURRENCY)
+    errors = [str(error) for error in outcome.errors.values()]
+    # Data tools report failures as ToolError dicts rather than raising.
+    errors += [f"{name}: {data['message']}" for name, data in outcome.results.items() if "error" in data]
+
+    table = compute_metrics(build_frame(outcome.results.values(), symbols=symbols))
+    return {"metrics": table.rows(), "errors": errors}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,296 @@
+import asyncio
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Iterator
+
+from pydantic_ai.agent import WrapperAgent
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models import ModelRequestParameters, StreamedResponse
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+from pydantic_graph import End
+from pydantic_graph.graph import GraphRun
+
+# Prometheus' default buckets, extended for multi-second LLM calls.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+# ============================================================================
+# Metric Primitives
+# ============================================================================
+
+def _outcome(exc: BaseException | None) -> str:
+    if exc is None:
+        return "success"
+    if isinstance(exc, asyncio.CancelledError):
+        return "cancelled"
+    return "error"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with a fixed set of label names."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[name]) for name in self.labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {value:g}" for key, value in items]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a fixed set of label names."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: bucket counts (last slot is +Inf), sum, count.
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(tuple(str(labels[name]) for name in self.labels))
+        return series[2] if series else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((key, [list(s[0]), s[1], s[2]]) for key, s in self._series.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                bucket_labels = _format_labels(self.labels, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {total:g}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together in Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format (0.0.4)."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# Standard Metrics
+# ============================================================================
+
+registry = MetricsRegistry()
+
+graph_node_duration = registry.histogram(
+    "graph_node_duration_seconds", "Duration of pydantic-graph node executions.", ("node", "outcome")
+)
+agent_run_duration = registry.histogram(
+    "agent_run_duration_seconds", "Duration of agent runs, including model requests and tool calls.", ("agent", "outcome")
+)
+model_request_duration = registry.histogram(
+    "model_request_duration_seconds", "Duration of individual model requests.", ("agent", "model", "outcome")
+)
+tool_call_duration = registry.histogram(
+    "tool_call_duration_seconds", "Duration of agent tool calls.", ("tool", "outcome")
+)
+llm_tokens = registry.counter(
+    "llm_tokens_total", "Tokens reported by model responses.", ("agent", "model", "direction")
+)
+
+# Name of the agent whose run is active in this task, used to label model requests.
+current_agent: contextvars.ContextVar[str] = contextvars.ContextVar("current_agent", default="unknown")
+
+
+def render_prometheus() -> str:
+    """Render the process-wide metrics for a ``/metrics`` endpoint."""
+    return registry.render()
+
+
+# ============================================================================
+# Instrumentation Hooks
+# ============================================================================
+
+class MetricsAgent(WrapperAgent):
+    """Agent wrapper recording run duration and outcome per agent name."""
+
+    def __init__(self, wrapped: Any, default_name: str = "unknown"):
+        super().__init__(wrapped)
+        self.default_name = default_name
+
+    @asynccontextmanager
+    async def iter(self, user_prompt: Any = None, **kwargs: Any) -> AsyncIterator[Any]:
+        name = self.name or self.default_name
+        token = current_agent.set(name)
+        start = time.perf_counter()
+        error = None
+        try:
+            async with self.wrapped.iter(user_prompt, **kwargs) as run:
+                yield run
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            agent_run_duration.observe(time.perf_counter() - start, agent=name, outcome=_outcome(error))
+            current_agent.reset(token)
+
+
+class MetricsModel(WrapperModel):
+    """Model wrapper recording request duration, outcome and token usage."""
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        agent = current_agent.get()
+        start = time.perf_counter()
+        error = None
+        try:
+            response = await super().request(messages, model_settings, model_request_parameters)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            model_request_duration.observe(
+                time.perf_counter() - start, agent=agent, model=self.model_name, outcome=_outcome(error)
+            )
+        self._record_tokens(agent, response.usage)
+        return response
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        run_context: Any = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        # The stream is consumed inside the context, so the duration covers the whole response.
+        agent = current_agent.get()
+        start = time.perf_counter()
+        error = None
+        response = None
+        try:
+            async with super().request_stream(
+                messages, model_settings, model_request_parameters, run_context
+            ) as response:
+                yield response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            model_request_duration.observe(
+                time.perf_counter() - start, agent=agent, model=self.model_name, outcome=_outcome(error)
+            )
+            if response is not None:
+                self._record_tokens(agent, response.usage())
+
+    def _record_tokens(self, agent: str, usage: Any) -> None:
+        llm_tokens.inc(usage.input_tokens, agent=agent, model=self.model_name, direction="input")
+        llm_tokens.inc(usage.output_tokens, agent=agent, model=self.model_name, direction="output")
+
+
+def timed_tool(func):
+    """Record the duration and outcome of an async tool under its function name."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        error = None
+        try:
+            return await func(*args, **kwargs)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            tool_call_duration.observe(time.perf_counter() - start, tool=func.__name__, outcome=_outcome(error))
+
+    return wrapper
+
+
+@contextmanager
+def timed_node(name: str) -> Iterator[None]:
+    """Record the duration and outcome of one graph node execution under ``name``."""
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        graph_node_duration.observe(time.perf_counter() - start, node=name, outcome=_outcome(error))
+
+
+async def timed_nodes(run: GraphRun) -> AsyncIterator[Any]:
+    """
+    Drive a pydantic-graph run node by node, timing each node.
+
+    Drop-in for ``async for node in run``: yields the same nodes, ending with
+    the ``End`` marker, while recording ``graph_node_duration_seconds``.
+    """
+    node = run.next_node
+    while not isinstance(node, End):
+        with timed_node(type(node).__name__):
+            node = await run.next(node)
+        yield node
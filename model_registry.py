@@ -0,0 +1,155 @@
+import functools
+import logging
+import os
+from dataclasses import dataclass
+
+import httpx
+from pydantic_ai.models import Model
+from pydantic_ai.models.wrapper import WrapperModel
+
+from metrics import MetricsModel
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# Pooled HTTP Clients
+# ============================================================================
+
+@dataclass(frozen=True)
+class HttpPoolConfig:
+    """Connection pool and timeout settings for one provider's HTTP client."""
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 60.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 600.0
+    pool_timeout: float = 30.0
+    http2: bool = False
+
+    @classmethod
+    def from_env(cls, provider: str) -> "HttpPoolConfig":
+        """Read overrides such as ``OPENAI_HTTP_MAX_CONNECTIONS`` or ``OPENAI_HTTP2``."""
+        prefix = f"{provider.upper()}_HTTP"
+        defaults = cls()
+        return cls(
+            max_connections=int(os.getenv(f"{prefix}_MAX_CONNECTIONS", defaults.max_connections)),
+            max_keepalive_connections=int(os.getenv(f"{prefix}_MAX_KEEPALIVE", defaults.max_keepalive_connections)),
+            keepalive_expiry=float(os.getenv(f"{prefix}_KEEPALIVE_EXPIRY", defaults.keepalive_expiry)),
+            connect_timeout=float(os.getenv(f"{prefix}_CONNECT_TIMEOUT", defaults.connect_timeout)),
+            read_timeout=float(os.getenv(f"{prefix}_READ_TIMEOUT", defaults.read_timeout)),
+            pool_timeout=float(os.getenv(f"{prefix}_POOL_TIMEOUT", defaults.pool_timeout)),
+            http2=os.getenv(f"{prefix}2", "0").lower() in ("1", "true", "yes"),
+        )
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+_http_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(provider: str = "openai") -> httpx.AsyncClient:
+    """
+    Return the shared keep-alive client for ``provider``, creating it on first use.
+
+    Every model handed out by this registry for the same provider reuses this
+    client, so concurrent agent calls share one warm connection pool.
+    """
+    client = _http_clients.get(provider)
+    if client is not None and not client.is_closed:
+        return client
+
+    config = HttpPoolConfig.from_env(provider)
+    http2 = config.http2
+    if http2 and not _http2_available():
+        logger.warning(f"HTTP/2 requested for {provider} but the 'h2' package is not installed; using HTTP/1.1")
+        http2 = False
+
+    client = httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            config.read_timeout,
+            connect=config.connect_timeout,
+            pool=config.pool_timeout,
+        ),
+    )
+    _http_clients[provider] = client
+    logger.info(f"Created pooled HTTP client for {provider}: {config}")
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close every pooled client; call on application or worker shutdown."""
+    for client in _http_clients.values():
+        await client.aclose()
+    _http_clients.clear()
+
+
+# ============================================================================
+# Model Registry
+# ============================================================================
+
+class PooledModel(WrapperModel):
+    """
+    Model handle bound to the provider's pooled HTTP client.
+
+    The concrete model and its provider are built on first use, so importing a
+    module that defines agents doesn't require credentials or open a client.
+    It is rebuilt whenever the pooled client it holds has been replaced, e.g.
+    after ``close_http_clients()`` on a lifespan restart.
+    """
+
+    def __init__(self, model_name: str, provider: str = "openai"):
+        Model.__init__(self)
+        self._model_name = model_name
+        self._provider = provider
+        self._wrapped: Model | None = None
+        self._http_client: httpx.AsyncClient | None = None
+
+    @property
+    def wrapped(self) -> Model:
+        if self._provider != "openai":
+            raise ValueError(f"Unsupported provider: {self._provider}")
+        client = get_http_client(self._provider)
+        if self._wrapped is None or client is not self._http_client:
+            # The OpenAI SDK is a large import; only pay for it when a model is used.
+            from pydantic_ai.models.openai import OpenAIChatModel
+            from pydantic_ai.providers.openai import OpenAIProvider
+
+            self._wrapped = OpenAIChatModel(self._model_name, provider=OpenAIProvider(http_client=client))
+            self._http_client = client
+        return self._wrapped
+
+    @property
+    def model_name(self) -> str:
+        return self._model_name
+
+    @property
+    def system(self) -> str:
+        return self._provider
+
+
+@functools.cache
+def get_model(model_name: str = "gpt-4o", provider: str = "openai") -> Model:
+    """
+    Return the shared model handle for ``model_name`` on ``provider``.
+
+    Args:
+        model_name: Provider model name, e.g. ``"gpt-4o"``
+        provider: Provider whose pooled HTTP client the model should use
+
+    Returns:
+        A PooledModel, wrapped to record request latency and token metrics
+    """
+    return MetricsModel(PooledModel(model_name, provider))
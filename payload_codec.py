@@ -0,0 +1,122 @@
+import dataclasses
+import logging
+import os
+import zlib
+from typing import Sequence
+
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import DataConverter, PayloadCodec
+from temporalio.plugin import SimplePlugin
+
+logger = logging.getLogger(__name__)
+
+# "zlib" or "zstd" to compress Temporal payloads; unset/"none" leaves them as JSON.
+PAYLOAD_CODEC = os.getenv("TEMPORAL_PAYLOAD_CODEC", "none").lower()
+
+# Payloads smaller than this many bytes are stored as-is; compression rarely pays below it.
+PAYLOAD_COMPRESSION_THRESHOLD = int(os.getenv("TEMPORAL_PAYLOAD_COMPRESSION_THRESHOLD", "1024"))
+
+ENCODINGS = {"zlib": b"binary/zlib", "zstd": b"binary/zstd"}
+
+
+# ============================================================================
+# Compression Codec
+# ============================================================================
+
+class CompressionCodec(PayloadCodec):
+    """
+    Compresses large payloads (model message histories, financial data) with zlib or zstd.
+
+    The whole serialized payload, metadata included, is compressed into a new
+    payload whose ``encoding`` metadata names the algorithm. Payloads under
+    ``threshold`` bytes, or that don't shrink, pass through untouched, so
+    decoding accepts a mix of compressed and plain payloads.
+    """
+
+    def __init__(self, algorithm: str = "zlib", threshold: int = PAYLOAD_COMPRESSION_THRESHOLD, level: int | None = None):
+        if algorithm not in ENCODINGS:
+            raise ValueError(f"Unknown payload compression {algorithm!r}, expected one of {', '.join(ENCODINGS)}")
+        if algorithm == "zstd" and not zstd_available():
+            logger.warning("zstd payload compression requested but 'zstandard' is not installed; using zlib")
+            algorithm = "zlib"
+        self.algorithm = algorithm
+        self.encoding = ENCODINGS[algorithm]
+        self.threshold = threshold
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        if self.algorithm == "zstd":
+            import zstandard
+
+            return zstandard.ZstdCompressor(level=self.level or 3).compress(data)
+        return zlib.compress(data, self.level if self.level is not None else 6)
+
+    @staticmethod
+    def decompress(encoding: bytes, data: bytes) -> bytes:
+        if encoding == ENCODINGS["zstd"]:
+            import zstandard
+
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    async def encode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        encoded = []
+        for payload in payloads:
+            raw = payload.SerializeToString()
+            if len(raw) >= self.threshold:
+                compressed = self.compress(raw)
+                if len(compressed) < len(raw):
+                    encoded.append(Payload(metadata={"encoding": self.encoding}, data=compressed))
+                    continue
+            encoded.append(payload)
+        return encoded
+
+    async def decode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        decoded = []
+        for payload in payloads:
+            encoding = payload.metadata.get("encoding")
+            if encoding in ENCODINGS.values():
+                decoded.append(Payload.FromString(self.decompress(encoding, payload.data)))
+            else:
+                decoded.append(payload)
+        return decoded
+
+
+def zstd_available() -> bool:
+    """Whether the optional ``zstandard`` package is installed."""
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# ============================================================================
+# Client/Worker Wiring
+# ============================================================================
+
+def payload_codec() -> CompressionCodec | None:
+    """Return the codec selected by ``TEMPORAL_PAYLOAD_CODEC``, or None when compression is off."""
+    if PAYLOAD_CODEC in ("", "none", "off"):
+        return None
+    return CompressionCodec(PAYLOAD_CODEC)
+
+
+class PayloadCompressionPlugin(SimplePlugin):
+    """
+    Temporal plugin installing ``payload_codec()`` on the client's data converter.
+
+    Combine with PydanticAIPlugin, which swaps the payload converter but keeps
+    the codec: ``Client.connect(..., plugins=[PydanticAIPlugin(), PayloadCompressionPlugin()])``.
+    Clients, workers and the codec server must agree on the setting.
+    """
+
+    def __init__(self, codec: PayloadCodec | None = None):
+        self.codec = codec or payload_codec()
+        super().__init__(name="PayloadCompressionPlugin", data_converter=self._data_converter)
+
+    def _data_converter(self, converter: DataConverter | None) -> DataConverter:
+        converter = converter or DataConverter.default
+        if self.codec is None:
+            return converter
+        return dataclasses.replace(converter, payload_codec=self.codec)
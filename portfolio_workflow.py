@@ -0,0 +1,213 @@
+"""
+Portfolio analysis as a parent workflow over per-company child workflows.
+
+``PortfolioWorkflow`` takes a list of companies and runs one
+``FinancialGraphWorkflow`` child per company, keeping at most
+``max_in_flight`` children running at once. Children are started by
+workflow type name, so either graph flavour works as long as a worker
+serving ``child_task_queue`` registers it. Results are recorded as each child
+finishes (see the ``progress`` and ``results`` queries), and a failed child
+is recorded as failed instead of failing the portfolio.
+
+The window bounds load on the server and, together with the workers'
+``--max-concurrent-activities``, on the model provider's rate limits.
+
+    python portfolio_workflow.py --companies Infosys "HDFC Bank" "Tata Motors" --max-in-flight 20
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+
+from temporalio import workflow
+from temporalio.exceptions import ChildWorkflowError, FailureError
+
+# Read at import: the workflow sandbox forbids os calls while a workflow runs.
+PORTFOLIO_MAX_IN_FLIGHT = int(os.getenv("PORTFOLIO_MAX_IN_FLIGHT", "20"))
+
+# Task queue of the child workflows; unset = the portfolio workflow's own.
+PORTFOLIO_CHILD_TASK_QUEUE = os.getenv("PORTFOLIO_CHILD_TASK_QUEUE") or None
+
+DEFAULT_QUERY_TEMPLATE = "Whats the balance sheet and cash flow of {company}"
+
+
+# ============================================================================
+# Workflow Payloads
+# ============================================================================
+
+@dataclass
+class PortfolioRequest:
+    """Companies to analyse and how to run their child workflows."""
+    companies: list[str]
+    query_template: str = DEFAULT_QUERY_TEMPLATE
+    max_in_flight: int = PORTFOLIO_MAX_IN_FLIGHT
+    child_workflow: str = "FinancialGraphWorkflow"
+    child_task_queue: str | None = PORTFOLIO_CHILD_TASK_QUEUE
+
+
+@dataclass
+class CompanyResult:
+    """Outcome of one company's child workflow."""
+    company: str
+    workflow_id: str
+    response: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class PortfolioProgress:
+    """Counts of children by status."""
+    total: int
+    completed: int = 0
+    failed: int = 0
+    in_flight: int = 0
+
+    @property
+    def pending(self) -> int:
+        return self.total - self.completed - self.failed - self.in_flight
+
+
+@dataclass
+class PortfolioResult:
+    """Per-company outcomes, in the order the companies were given."""
+    results: list[CompanyResult] = field(default_factory=list)
+
+    @property
+    def failed(self) -> list[CompanyResult]:
+        return [result for result in self.results if not result.ok]
+
+
+# ============================================================================
+# Workflow
+# ============================================================================
+
+def _child_id(parent_id: str, index: int, company: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", company.lower()).strip("-")
+    return f"{parent_id}/{index}-{slug}"
+
+
+@workflow.defn
+class PortfolioWorkflow:
+    """Fans a portfolio out to bounded per-company child workflows and collects what completes."""
+
+    def __init__(self) -> None:
+        self.progress_state = PortfolioProgress(total=0)
+        self.completed: dict[int, CompanyResult] = {}
+
+    @workflow.run
+    async def run(self, request: PortfolioRequest) -> PortfolioResult:
+        parent_id = workflow.info().workflow_id
+        self.progress_state = PortfolioProgress(total=len(request.companies))
+        window = asyncio.Semaphore(max(request.max_in_flight, 1))
+        workflow.logger.info(
+            f"Analysing {len(request.companies)} companies, at most {request.max_in_flight} at a time"
+        )
+
+        async def analyse(index: int, company: str) -> None:
+            child_id = _child_id(parent_id, index, company)
+            async with window:
+                self.progress_state.in_flight += 1
+                try:
+                    response = await workflow.execute_child_workflow(
+                        request.child_workflow,
+                        request.query_template.format(company=company),
+                        id=child_id,
+                        task_queue=request.child_task_queue,
+                        result_type=str,
+                    )
+                    result = CompanyResult(company, child_id, response=response)
+                    self.progress_state.completed += 1
+                except (ChildWorkflowError, FailureError) as e:
+                    cause = e.cause if isinstance(e, ChildWorkflowError) and e.cause is not None else e
+                    result = CompanyResult(company, child_id, error=f"{type(cause).__name__}: {cause}")
+                    self.progress_state.failed += 1
+                    workflow.logger.warning(f"Child workflow {child_id} failed: {result.error}")
+                finally:
+                    self.progress_state.in_flight -= 1
+            self.completed[index] = result
+
+        await asyncio.gather(*(analyse(index, company) for index, company in enumerate(request.companies)))
+        return PortfolioResult(results=[self.completed[index] for index in range(len(request.companies))])
+
+    @workflow.query
+    def progress(self) -> PortfolioProgress:
+        """Children completed, failed, running and not yet started."""
+        return self.progress_state
+
+    @workflow.query
+    def results(self) -> list[CompanyResult]:
+        """Outcomes of the children that have finished so far."""
+        return [self.completed[index] for index in sorted(self.completed)]
+
+
+# ============================================================================
+# Client
+# ============================================================================
+
+async def run_portfolio(
+    companies: list[str],
+    task_queue: str,
+    address: str = "localhost:7233",
+    max_in_flight: int = PORTFOLIO_MAX_IN_FLIGHT,
+    poll_seconds: float = 5.0,
+) -> PortfolioResult:
+    """
+    Start a PortfolioWorkflow and print its progress until it finishes.
+
+    Args:
+        companies: Company names, one child workflow each
+        task_queue: Queue served by workers registering PortfolioWorkflow and the child workflow
+        address: Temporal server address
+        max_in_flight: Most child workflows running at once
+        poll_seconds: Interval between progress queries
+
+    Returns:
+        The per-company results
+    """
+    from pydantic_ai.durable_exec.temporal import PydanticAIPlugin
+    from temporalio.client import Client
+
+    from payload_codec import PayloadCompressionPlugin
+
+    client = await Client.connect(address, plugins=[PydanticAIPlugin(), PayloadCompressionPlugin()])
+    handle = await client.start_workflow(
+        PortfolioWorkflow.run,
+        PortfolioRequest(companies=companies, max_in_flight=max_in_flight),
+        id=f"portfolio-{int(time.time())}",
+        task_queue=task_queue,
+    )
+    result = asyncio.ensure_future(handle.result())
+    while not result.done():
+        await asyncio.wait([result], timeout=poll_seconds)
+        if not result.done():
+            progress = await handle.query(PortfolioWorkflow.progress)
+            print(
+                f"{progress.completed} completed, {progress.failed} failed, "
+                f"{progress.in_flight} running, {progress.pending} pending"
+            )
+    return await result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--companies", nargs="+", required=True)
+    parser.add_argument("--task-queue", default="financial-graph-queue-2")
+    parser.add_argument("--address", default=os.getenv("TEMPORAL_ADDRESS", "localhost:7233"))
+    parser.add_argument("--max-in-flight", type=int, default=PORTFOLIO_MAX_IN_FLIGHT)
+    args = parser.parse_args()
+
+    portfolio = asyncio.run(run_portfolio(args.companies, args.task_queue, args.address, args.max_in_flight))
+    for result in portfolio.results:
+        print(f"{result.company}: {result.response if result.ok else 'FAILED ' + result.error}")
+    return 1 if portfolio.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
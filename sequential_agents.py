@@ -1,19 +1,17 @@
 import asyncio
 import logging
-from agents import company_name_provider_agent, balance_sheet_agent
-import logfire
+from agent_registry import configure_instrumentation
+from agents import registry
 
 
-logfire.configure()
-logfire.instrument_pydantic_ai()
-
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 
 async def main() :
-    result =  await company_name_provider_agent.run("Whats the company symbol for Reliance digital")
+    configure_instrumentation()
+    result =  await registry.get("company_name_provider_agent").run("Whats the company symbol for Reliance digital")
     logger.info(f"result--->${result.output}")
 
 
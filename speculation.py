@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable
+
+from metrics import registry as metrics_registry
+from symbol_index import SymbolMatch
+
+logger = logging.getLogger(__name__)
+
+# Start statement fetches for the locally guessed symbol while the LLM resolves it.
+SPECULATIVE_PREFETCH = os.getenv("SPECULATIVE_PREFETCH", "0").lower() in ("1", "true", "yes")
+
+# Weakest local match still worth speculating on; confident matches skip the LLM anyway.
+SPECULATIVE_MIN_SCORE = float(os.getenv("SPECULATIVE_MIN_SCORE", "0.5"))
+
+speculation_counter = metrics_registry.counter(
+    "speculative_prefetch_total", "Symbol guesses checked against the resolved symbol.", ("outcome",)
+)
+speculative_fetch_counter = metrics_registry.counter(
+    "speculative_fetches_total", "Speculative statement fetches by what became of them.", ("outcome",)
+)
+
+
+# ============================================================================
+# Stats
+# ============================================================================
+
+@dataclass
+class SpeculationStats:
+    """
+    Counters for judging whether speculation pays off.
+
+    ``hit_ratio`` is the share of guesses that matched the resolved symbol;
+    ``waste_ratio`` the share of started fetches whose data was not used.
+    """
+    speculations: int = 0
+    hits: int = 0
+    misses: int = 0
+    fetches_started: int = 0
+    fetches_kept: int = 0
+    fetches_cancelled: int = 0
+    fetches_wasted: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.speculations if self.speculations else 0.0
+
+    @property
+    def waste_ratio(self) -> float:
+        unused = self.fetches_cancelled + self.fetches_wasted
+        return unused / self.fetches_started if self.fetches_started else 0.0
+
+
+speculation_stats = SpeculationStats()
+
+
+def speculation_snapshot() -> dict:
+    """Return the process-wide speculation counters and ratios for reporting."""
+    return {
+        "hit_ratio": round(speculation_stats.hit_ratio, 4),
+        "waste_ratio": round(speculation_stats.waste_ratio, 4),
+        **asdict(speculation_stats),
+    }
+
+
+# ============================================================================
+# Speculation
+# ============================================================================
+
+class Speculation:
+    """
+    Statement fetches started for a guessed symbol before the real one is known.
+
+    Fetches go through the cached statement tools, so when the guess is right
+    the agents later find the data in ``financial_data_cache`` (or join the
+    fetch still in flight). ``settle`` keeps the fetches for the resolved
+    symbol and cancels the rest.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        fetchers: dict[str, Callable[[str], Awaitable[Any]]],
+        stats: SpeculationStats = speculation_stats,
+    ):
+        self.symbol = symbol.strip().upper()
+        self.stats = stats
+        # Cancelling one of these also stops the cached fetch, unless an agent joined it.
+        self.tasks = {
+            statement: asyncio.ensure_future(fetch(self.symbol))
+            for statement, fetch in fetchers.items()
+        }
+        stats.speculations += 1
+        stats.fetches_started += len(self.tasks)
+        logger.info(f"Speculatively fetching {', '.join(self.tasks)} for {self.symbol}")
+
+    @classmethod
+    def start(
+        cls,
+        match: SymbolMatch | None,
+        fetchers: dict[str, Callable[[str], Awaitable[Any]]],
+    ) -> "Speculation | None":
+        """
+        Start speculating on ``match`` if speculation is enabled and the match is plausible.
+
+        Args:
+            match: Best local guess for the query's symbol, possibly None
+            fetchers: Statement type (the ``cached_statement`` key) to fetcher taking a symbol
+
+        Returns:
+            The running Speculation, or None if nothing was started
+        """
+        if not SPECULATIVE_PREFETCH or match is None or match.score < SPECULATIVE_MIN_SCORE:
+            return None
+        return cls(match.symbol, fetchers)
+
+    def settle(self, resolved_symbol: str | None) -> bool:
+        """
+        Keep the fetches if the guess was right, cancel them otherwise.
+
+        Args:
+            resolved_symbol: Symbol the resolver settled on, or None if it failed
+
+        Returns:
+            True if the guess matched
+        """
+        hit = resolved_symbol is not None and resolved_symbol.strip().upper() == self.symbol
+        self.stats.hits += hit
+        self.stats.misses += not hit
+        speculation_counter.inc(outcome="hit" if hit else "miss")
+        for task in self.tasks.values():
+            if hit:
+                outcome = "kept"
+                self.stats.fetches_kept += 1
+                # Errors resurface when the agent's own tool call reads the cache.
+                task.add_done_callback(_consume_result)
+            elif task.done():
+                outcome = "wasted"
+                self.stats.fetches_wasted += 1
+                _consume_result(task)
+            else:
+                outcome = "cancelled"
+                self.stats.fetches_cancelled += 1
+                task.cancel()
+            speculative_fetch_counter.inc(outcome=outcome)
+        logger.info(f"Speculation on {self.symbol} {'hit' if hit else f'missed ({resolved_symbol})'}")
+        return hit
+
+
+def _consume_result(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
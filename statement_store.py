@@ -0,0 +1,259 @@
+"""
+Memory-mapped columnar store for financial statements.
+
+A store is a directory of ``.npy`` files opened with ``mmap_mode="r"``:
+
+    meta.json        statements, their fields, row count
+    symbols.npy      fixed-width symbol per row
+    index.npy        open-addressing hash table: crc32(symbol) -> row
+    <stmt>.<n>.npy   float64 column for the statement's n-th field (NaN = missing)
+
+Nothing is parsed or copied when a store is opened, so every uvicorn and
+Temporal worker process maps the same page-cached files, and a lookup is a
+hash probe plus one read per column. Point ``STATEMENT_STORE_PATH`` at a
+store and the data tools serve from it; symbols not in the store fall back
+to the tools' own source.
+
+Build one from CSV (header ``symbol,type,<field>...``, one statement per
+row) or JSON (a list, or JSON lines, of tool-style dicts)::
+
+    python statement_store.py ingest statements.csv more.jsonl --out data/statements
+    python statement_store.py get data/statements RELIANCE.NS
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+
+from handoff import StatementFigures
+
+logger = logging.getLogger(__name__)
+
+# Directory of the store the data tools read from; unset = no store.
+STATEMENT_STORE_PATH = os.getenv("STATEMENT_STORE_PATH", "")
+
+FORMAT_VERSION = 1
+
+
+def _normalize(symbol: str) -> bytes:
+    return symbol.strip().upper().encode()
+
+
+def _slot(key: bytes, mask: int) -> int:
+    # crc32, not hash(): it must agree across processes and runs.
+    return zlib.crc32(key) & mask
+
+
+# ============================================================================
+# Reader
+# ============================================================================
+
+class StatementStore:
+    """Read-only, memory-mapped view of a statement store directory."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        meta = json.loads((self.path / "meta.json").read_text())
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{self.path}: unsupported statement store version {meta.get('version')}")
+        self.statements: dict[str, list[str]] = meta["statements"]
+        self.rows: int = meta["rows"]
+        self.symbols = np.load(self.path / "symbols.npy", mmap_mode="r")
+        self.index = np.load(self.path / "index.npy", mmap_mode="r")
+        self.columns = {
+            f"{statement}.{name}": np.load(self.path / f"{statement}.{i}.npy", mmap_mode="r")
+            for statement, names in self.statements.items()
+            for i, name in enumerate(names)
+        }
+        self._mask = len(self.index) - 1
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.row(symbol) is not None
+
+    def row(self, symbol: str) -> int | None:
+        """Row of ``symbol``, or None; expected O(1) via linear probing."""
+        key = _normalize(symbol)
+        slot = _slot(key, self._mask)
+        while (row := int(self.index[slot])) >= 0:
+            if self.symbols[row] == key:
+                return row
+            slot = (slot + 1) & self._mask
+        return None
+
+    def get(self, symbol: str, statement: str) -> dict | None:
+        """
+        Return one statement in the data tools' dict shape.
+
+        Args:
+            symbol: Ticker, case-insensitive
+            statement: Statement type, e.g. ``"balance_sheet"``
+
+        Returns:
+            ``{"type", "symbol", <field>: value...}`` without missing fields, or
+            None if the symbol or statement isn't stored
+        """
+        if statement not in self.statements:
+            return None
+        row = self.row(symbol)
+        if row is None:
+            return None
+        figures = {}
+        for name in self.statements[statement]:
+            value = float(self.columns[f"{statement}.{name}"][row])
+            if value == value:  # NaN marks a missing figure
+                figures[name] = int(value) if value.is_integer() else value
+        if not figures:
+            return None
+        return {"type": statement, "symbol": self.symbols[row].decode(), **figures}
+
+
+_store: StatementStore | None = None
+
+
+def get_statement_store() -> StatementStore | None:
+    """Return the store at ``STATEMENT_STORE_PATH``, opened on first use, or None when unset."""
+    global _store
+    if _store is None and STATEMENT_STORE_PATH:
+        _store = StatementStore(STATEMENT_STORE_PATH)
+        logger.info(f"Statement store {STATEMENT_STORE_PATH}: {len(_store)} symbols, {len(_store.columns)} columns")
+    return _store
+
+
+def lookup_statement(statement: str, symbol: str) -> dict | None:
+    """The stored statement for ``symbol``, or None when no store is configured or it lacks the symbol."""
+    store = get_statement_store()
+    return store.get(symbol, statement) if store is not None else None
+
+
+# ============================================================================
+# Ingestion
+# ============================================================================
+
+def read_records(path: str | Path) -> Iterator[dict]:
+    """Yield tool-style statement dicts from a CSV, JSON or JSON-lines file."""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="") as f:
+            for row in csv.DictReader(f):
+                record: dict[str, Any] = {}
+                for name, value in row.items():
+                    if value in (None, ""):
+                        continue
+                    try:
+                        record[name] = float(value) if name not in ("symbol", "type") else value
+                    except ValueError:
+                        record[name] = value
+                yield record
+        return
+    text = path.read_text()
+    if text.lstrip().startswith("["):
+        yield from json.loads(text)
+    else:
+        yield from (json.loads(line) for line in text.splitlines() if line.strip())
+
+
+def build_store(records: Iterable[dict], out: str | Path) -> dict:
+    """
+    Write a store from statement dicts, replacing ``out`` once it is complete.
+
+    Each dict needs ``symbol`` and ``type``; its numeric fields (nested dicts
+    flattened with ``.``) become columns. A later record for the same symbol
+    and statement overrides earlier figures.
+
+    Returns:
+        The store's metadata
+    """
+    merged: dict[bytes, dict[str, dict[str, float]]] = {}
+    statements: dict[str, dict[str, None]] = {}
+    for data in records:
+        record = StatementFigures.from_dict(data)
+        if record is None or not record.symbol or not record.statement:
+            continue
+        merged.setdefault(_normalize(record.symbol), {}).setdefault(record.statement, {}).update(record.figures)
+        statements.setdefault(record.statement, {}).update(dict.fromkeys(record.figures))
+
+    keys = list(merged)
+    rows = len(keys)
+    width = max((len(key) for key in keys), default=1)
+    table_size = 1 << max((rows * 2 - 1).bit_length(), 3)
+    index = np.full(table_size, -1, dtype=np.int32)
+    for row, key in enumerate(keys):
+        slot = _slot(key, table_size - 1)
+        while index[slot] >= 0:
+            slot = (slot + 1) & (table_size - 1)
+        index[slot] = row
+
+    out = Path(out)
+    staging = out.with_name(f".{out.name}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    np.save(staging / "symbols.npy", np.array(keys, dtype=f"S{width}"))
+    np.save(staging / "index.npy", index)
+    for statement, names in statements.items():
+        for i, name in enumerate(names):
+            column = np.full(rows, np.nan)
+            for row, key in enumerate(keys):
+                value = merged[key].get(statement, {}).get(name)
+                if value is not None:
+                    column[row] = value
+            # Files are numbered, so field names needn't be valid file names.
+            np.save(staging / f"{statement}.{i}.npy", column)
+    meta = {
+        "version": FORMAT_VERSION,
+        "rows": rows,
+        "statements": {statement: list(names) for statement, names in statements.items()},
+    }
+    (staging / "meta.json").write_text(json.dumps(meta, indent=2))
+
+    if out.exists():
+        # Readers keep their mappings of the old files; new opens see the new store.
+        shutil.rmtree(out)
+    staging.rename(out)
+    return meta
+
+
+# ============================================================================
+# Entry Point
+# ============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="build a store from CSV/JSON statement files")
+    ingest.add_argument("inputs", nargs="+")
+    ingest.add_argument("--out", default=STATEMENT_STORE_PATH or "data/statements")
+    get = commands.add_parser("get", help="print a symbol's stored statements")
+    get.add_argument("store")
+    get.add_argument("symbol")
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        start = time.perf_counter()
+        meta = build_store((record for path in args.inputs for record in read_records(path)), args.out)
+        columns = sum(len(names) for names in meta["statements"].values())
+        print(f"Wrote {meta['rows']} symbols x {columns} columns to {args.out} in {time.perf_counter() - start:.2f}s")
+        return 0
+
+    store = StatementStore(args.store)
+    start = time.perf_counter()
+    found = {statement: store.get(args.symbol, statement) for statement in store.statements}
+    elapsed_us = (time.perf_counter() - start) * 1e6
+    print(json.dumps(found, indent=2))
+    print(f"lookup {elapsed_us:.0f}us", file=sys.stderr)
+    return 0 if any(found.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
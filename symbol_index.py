@@ -0,0 +1,256 @@
+import csv
+import functools
+import logging
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYMBOL_INDEX_PATH = Path(__file__).with_name("symbols.csv")
+
+# Matches scoring at or above this are trusted without asking the LLM.
+MIN_CONFIDENCE = float(os.getenv("SYMBOL_INDEX_MIN_CONFIDENCE", "0.8"))
+
+# Corporate suffixes and filler words that don't help identify a company.
+_NOISE_WORDS = frozenset({
+    "the", "and", "of", "ltd", "limited", "inc", "incorporated", "corp",
+    "corporation", "co", "company", "plc", "llc", "com",
+})
+
+# Words that, right after a known alias, usually name a different company
+# of the same group ("Reliance Power", "HDFC Life", "Adani Ports").
+_NAME_CONTINUATIONS = frozenset({
+    "bank", "capital", "energy", "finance", "financial", "gas", "green",
+    "holdings", "infra", "infrastructure", "insurance", "investments", "life",
+    "motors", "pharma", "ports", "power", "retail", "securities", "steel",
+    "telecom", "transmission", "wilmar",
+})
+
+# Score for an alias found inside a longer, unrecognised company name.
+PARTIAL_NAME_SCORE = 0.6
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_WORD = re.compile(r"[A-Za-z0-9]+")
+_SYMBOL_TOKEN = re.compile(r"^[A-Z][A-Z0-9&-]*(\.[A-Z]{1,3})?$")
+
+
+# ============================================================================
+# Matching Primitives
+# ============================================================================
+
+@dataclass(frozen=True)
+class SymbolMatch:
+    """A resolved company symbol together with how confident the match is."""
+    symbol: str
+    name: str
+    score: float
+    method: str
+
+    @property
+    def confident(self) -> bool:
+        return self.score >= MIN_CONFIDENCE
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, strip punctuation and drop corporate noise words."""
+    tokens = _NON_ALNUM.sub(" ", text.lower()).split()
+    return " ".join(token for token in tokens if token not in _NOISE_WORDS)
+
+
+def trigrams(text: str) -> set[str]:
+    """Character trigrams of a normalized name, padded so short names still match."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# ============================================================================
+# Symbol Index
+# ============================================================================
+
+class SymbolIndex:
+    """
+    In-memory company name to ticker symbol index.
+
+    Lookups try, in order: exact alias, ticker symbol, normalized alias and
+    finally trigram (Dice coefficient) fuzzy matching. Each tier reports a
+    score so callers can fall back to the LLM resolver when unsure.
+    """
+
+    def __init__(self):
+        self._names: dict[str, str] = {}
+        self._exact: dict[str, str] = {}
+        self._symbols: dict[str, str] = {}
+        self._normalized: dict[str, str] = {}
+        self._owners: dict[str, set[str]] = defaultdict(set)
+        self._alias_words: set[str] = set()
+        self._grams: dict[str, set[str]] = {}
+        self._gram_postings: dict[str, set[str]] = defaultdict(set)
+        self._max_alias_tokens = 1
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, symbol: str, name: str, aliases: list[str] | tuple[str, ...] = ()) -> None:
+        """Register a symbol under its official name and any aliases."""
+        symbol = symbol.strip().upper()
+        self._names[symbol] = name
+        self._symbols[symbol] = symbol
+        self._symbols.setdefault(symbol.split(".")[0], symbol)
+        for alias in (name, *aliases):
+            alias = alias.strip()
+            if not alias:
+                continue
+            self._exact[alias.lower()] = symbol
+            normalized = normalize_name(alias)
+            if not normalized:
+                continue
+            self._normalized.setdefault(normalized, symbol)
+            self._owners[normalized].add(symbol)
+            self._alias_words.update(normalized.split())
+            self._max_alias_tokens = max(self._max_alias_tokens, len(normalized.split()))
+            grams = trigrams(normalized)
+            self._grams[normalized] = grams
+            for gram in grams:
+                self._gram_postings[gram].add(normalized)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "SymbolIndex":
+        """
+        Load an index from a CSV file with ``symbol``, ``name`` and ``aliases`` columns.
+
+        Args:
+            path: CSV path; ``aliases`` is a ``|``-separated list and may be empty
+
+        Returns:
+            The populated SymbolIndex
+        """
+        index = cls()
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                aliases = [alias for alias in (row.get("aliases") or "").split("|") if alias]
+                index.add(row["symbol"], row["name"], aliases)
+        logger.info(f"Loaded {len(index)} symbols from {path}")
+        return index
+
+    def _match(self, symbol: str, score: float, method: str) -> SymbolMatch:
+        return SymbolMatch(symbol=symbol, name=self._names[symbol], score=score, method=method)
+
+    def _fuzzy(self, normalized: str) -> SymbolMatch | None:
+        grams = trigrams(normalized)
+        candidates = set()
+        for gram in grams:
+            candidates |= self._gram_postings.get(gram, set())
+        best, best_score = None, 0.0
+        for candidate in candidates:
+            other = self._grams[candidate]
+            score = 2 * len(grams & other) / (len(grams) + len(other))
+            if score > best_score:
+                best, best_score = candidate, score
+        if best is None:
+            return None
+        return self._match(self._normalized[best], round(best_score, 4), "fuzzy")
+
+    def _continues_name(self, original: str) -> bool:
+        """Whether a query word next to an alias looks like more of a company name."""
+        word = original.lower()
+        if word in _NOISE_WORDS:
+            return False
+        if word in self._alias_words or word in _NAME_CONTINUATIONS:
+            return True
+        return original.isalpha() and original[0].isupper()
+
+    def _window_score(self, window: str, tokens: list[str], first: int, last: int) -> float:
+        """
+        Score a normalized-alias hit spanning ``tokens[first:last + 1]`` of a query.
+
+        A hit is only trusted when the alias belongs to a single symbol and
+        the words around it don't carry the name on, e.g. "Reliance Power" is
+        a different company from "Reliance" and "HDFC Life" is not HDFC Bank.
+        The query's first word is capitalized anyway and is not counted.
+        """
+        if len(self._owners[window]) > 1:
+            return PARTIAL_NAME_SCORE
+        neighbours = tokens[max(first - 1, 1):first] + tokens[last + 1:last + 2]
+        if any(self._continues_name(token) for token in neighbours):
+            return PARTIAL_NAME_SCORE
+        return 0.95
+
+    def lookup(self, company_name: str) -> SymbolMatch | None:
+        """
+        Resolve a company name or ticker to a symbol.
+
+        Args:
+            company_name: Free-form company name, alias or ticker
+
+        Returns:
+            The best SymbolMatch, or None when nothing resembles the input
+        """
+        text = company_name.strip()
+        if text.lower() in self._exact:
+            return self._match(self._exact[text.lower()], 1.0, "exact")
+        if text.upper() in self._symbols:
+            return self._match(self._symbols[text.upper()], 1.0, "symbol")
+        normalized = normalize_name(text)
+        if not normalized:
+            return None
+        if normalized in self._normalized:
+            return self._match(self._normalized[normalized], 0.95, "normalized")
+        return self._fuzzy(normalized)
+
+    def resolve_query(self, query: str) -> SymbolMatch | None:
+        """
+        Find the company mentioned in a free-form user query.
+
+        Uppercase ticker-like tokens are checked first, then every window of
+        query words against the normalized aliases (longest window wins), and
+        only then fuzzy matching over the same windows. An alias that is only
+        part of a longer company name, or that several symbols share, scores
+        below ``MIN_CONFIDENCE`` so callers fall back to the LLM resolver.
+
+        Args:
+            query: User query such as "Whats the balance sheet of Reliance digital"
+
+        Returns:
+            The best SymbolMatch, or None when the query names no known company
+        """
+        for token in query.replace(",", " ").replace("?", " ").split():
+            if _SYMBOL_TOKEN.match(token) and token in self._symbols:
+                return self._match(self._symbols[token], 1.0, "symbol")
+
+        tokens = _WORD.findall(query)
+        # Normalized query words alongside their position in ``tokens``.
+        positions = [i for i, token in enumerate(tokens) if token.lower() not in _NOISE_WORDS]
+        words = [tokens[i].lower() for i in positions]
+        best = None
+        for size in range(min(self._max_alias_tokens, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                window = " ".join(words[start:start + size])
+                if window not in self._normalized:
+                    continue
+                score = self._window_score(window, tokens, positions[start], positions[start + size - 1])
+                if score >= MIN_CONFIDENCE:
+                    return self._match(self._normalized[window], score, "normalized")
+                if best is None:
+                    best = self._match(self._normalized[window], score, "partial")
+        if best is not None:
+            return best
+
+        for size in range(min(self._max_alias_tokens, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                window = " ".join(words[start:start + size])
+                if len(window) < 5:
+                    # Short single words fuzzy-match almost anything.
+                    continue
+                match = self._fuzzy(window)
+                if match and (best is None or match.score > best.score):
+                    best = match
+        return best
+
+
+@functools.lru_cache(maxsize=1)
+def get_symbol_index() -> SymbolIndex:
+    """Return the process-wide index, loading it from ``SYMBOL_INDEX_PATH`` on first use."""
+    return SymbolIndex.from_file(os.getenv("SYMBOL_INDEX_PATH", DEFAULT_SYMBOL_INDEX_PATH))
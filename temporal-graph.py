@@ -1,10 +1,13 @@
 import asyncio
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import timedelta
 import time
 from typing import Dict, Any
 from dotenv import load_dotenv
 from pydantic_ai import Agent, RunContext
+from model_registry import get_model
+from statement_store import lookup_statement
+from symbol_index import get_symbol_index
 from temporalio import workflow, activity
 from temporalio.client import Client
 from temporalio.worker import Worker
@@ -14,6 +17,11 @@ from pydantic_ai.durable_exec.temporal import (
     PydanticAIWorkflow,
     TemporalAgent,
 )
+from fanout import Branch, FanOutNode, FanOutResult
+from handoff import StatementFigures, handoff_serializer
+from payload_codec import PayloadCompressionPlugin
+from tool_resilience import resilient_tool
+from temporal_graph_executor import GraphCheckpoint, WorkflowGraphRunner, agent_activity_config, register_graph
 from pydantic_graph import BaseNode, Graph, End, GraphRunContext
 
 load_dotenv()
@@ -37,7 +45,7 @@ class FinalResult:
 
 
 company_name_provider_agent = Agent(
-    model="gpt-4o",
+    model=get_model("gpt-4o"),
     name="company_name_provider_agent",
     system_prompt="Get the company symbol from the query.",
     output_type=CompanySymbol,
@@ -45,17 +53,24 @@ company_name_provider_agent = Agent(
 
 @company_name_provider_agent.tool
 async def get_company_name(ctx: RunContext[None], company_name: str):
+    match = get_symbol_index().lookup(company_name)
+    if match and match.confident:
+        return CompanySymbol(symbol=match.symbol)
     return CompanySymbol(symbol="RELIANCE.NS")
 
 balance_sheet_agent = Agent(
-    model="gpt-4o",
+    model=get_model("gpt-4o"),
     name="balance_sheet_agent",
     system_prompt="Return the balance sheet data. Use the tool provided.",
     output_type=FinancialData 
 )
 
 @balance_sheet_agent.tool
+@resilient_tool("balance_sheet")
 async def get_balance_sheet(ctx: RunContext[None], symbol: str) -> dict:
+    stored = lookup_statement("balance_sheet", symbol)
+    if stored is not None:
+        return stored
     return {
         "type": "balance_sheet",
         "symbol": symbol,
@@ -64,14 +79,18 @@ async def get_balance_sheet(ctx: RunContext[None], symbol: str) -> dict:
     }
 
 cash_flow_agent = Agent(
-    model="gpt-4o",
+    model=get_model("gpt-4o"),
     name="cash_flow_agent",
     system_prompt="Return the cash flow data. Use the tool provided.",
     output_type=FinancialData
 )
 
 @cash_flow_agent.tool
+@resilient_tool("cash_flow")
 async def get_cash_flow(ctx: RunContext[None], symbol: str) -> dict:
+    stored = lookup_statement("cash_flow", symbol)
+    if stored is not None:
+        return stored
     return {
         "type": "cash_flow",
         "symbol": symbol,
@@ -80,15 +99,16 @@ async def get_cash_flow(ctx: RunContext[None], symbol: str) -> dict:
     }
 
 summarizer_agent = Agent(
-    model="gpt-4o",
+    model=get_model("gpt-4o"),
     name="summarizer_agent",
     system_prompt="Summarize the provided financial information into a brief paragraph."
 )
 
-temporal_company_name_agent = TemporalAgent(company_name_provider_agent)
-temporal_balance_sheet_agent = TemporalAgent(balance_sheet_agent)
-temporal_cash_flow_agent = TemporalAgent(cash_flow_agent,)       
-temporal_summarizer_agent = TemporalAgent(summarizer_agent)
+# Model and tool activities go to GRAPH_ACTIVITY_TASK_QUEUE when it is set.
+temporal_company_name_agent = TemporalAgent(company_name_provider_agent, activity_config=agent_activity_config())
+temporal_balance_sheet_agent = TemporalAgent(balance_sheet_agent, activity_config=agent_activity_config())
+temporal_cash_flow_agent = TemporalAgent(cash_flow_agent, activity_config=agent_activity_config())
+temporal_summarizer_agent = TemporalAgent(summarizer_agent, activity_config=agent_activity_config())
 
 # =====================================================================
 # PYDANTIC GRAPH NODES
@@ -100,35 +120,55 @@ class CompanyNameResolver(BaseNode[CompanyState]):
         result = await temporal_company_name_agent.run(ctx.state.user_query)
         return BalanceSheetAndCashflow(symbol=result.output.symbol)
 
+async def fetch_data(agent: TemporalAgent, prompt: str) -> dict:
+    """Run a data agent and keep only its serialisable payload."""
+    result = await agent.run(prompt)
+    return result.output.data
+
 @dataclass
-class BalanceSheetAndCashflow(BaseNode[CompanyState]):
+class BalanceSheetAndCashflow(FanOutNode[CompanyState]):
     symbol: str
+
+    def branches(self, ctx: GraphRunContext[CompanyState]) -> list[Branch]:
+        return [
+            Branch("balance_sheet", lambda: fetch_data(temporal_balance_sheet_agent, f"Get balance sheet for {self.symbol}")),
+            Branch("cash_flow", lambda: fetch_data(temporal_cash_flow_agent, f"Get cash flow for {self.symbol}")),
+        ]
     
+    def next_node(self, ctx: GraphRunContext[CompanyState], outcome: FanOutResult) -> "Summarizer":
+        # A failed or timed-out branch is passed on as an error instead of failing the graph.
+        records = {name: StatementFigures.from_dict(outcome.get(name), name) for name in ("balance_sheet", "cash_flow")}
+        errors = [str(error) for error in outcome.errors.values()]
+        errors += [f"{name}: no figures returned" for name, record in records.items() if record is None and name not in outcome.errors]
+        return Summarizer(balance_sheet=records["balance_sheet"], cash_flow=records["cash_flow"], errors=errors)
+
     async def run(self, ctx: GraphRunContext[CompanyState]) -> "Summarizer":
-        balance, cashflow = await asyncio.gather(
-            temporal_balance_sheet_agent.run(f"Get balance sheet for {self.symbol}"),
-            temporal_cash_flow_agent.run(f"Get cash flow for {self.symbol}")
-        )
-        return Summarizer(
-            balance_sheet_info=str(balance.output.data),
-            cash_flow_info=str(cashflow.output.data)
-        )
+        return self.next_node(ctx, await self.fan_out(ctx))
 
 @dataclass
 class Summarizer(BaseNode[CompanyState]):
-    balance_sheet_info: str
-    cash_flow_info: str
+    balance_sheet: StatementFigures | None
+    cash_flow: StatementFigures | None
+    errors: list[str] = field(default_factory=list)
     
     async def run(self, ctx: GraphRunContext[CompanyState]) -> End[FinalResult]:
-        result = await temporal_summarizer_agent.run(
-            f"Balance Sheet: {self.balance_sheet_info}, Cash Flow: {self.cash_flow_info}"
+        prompt = "Figures (K/M/B/T = thousand/million/billion/trillion):\n" + handoff_serializer.render(
+            [self.balance_sheet, self.cash_flow], self.errors
         )
+        if self.errors:
+            prompt += "\nSay briefly which data could not be fetched."
+        result = await temporal_summarizer_agent.run(prompt)
         return End(FinalResult(response=result.output))
 
 # =====================================================================
 # WORKFLOW (Orchestration with PydanticGraph)
 # =====================================================================
 
+financial_graph = register_graph(
+    "financial_in_workflow",
+    Graph(nodes=(CompanyNameResolver, BalanceSheetAndCashflow, Summarizer), run_end_type=FinalResult),
+)
+
 @workflow.defn
 class FinancialGraphWorkflow(PydanticAIWorkflow):
     
@@ -139,32 +179,37 @@ class FinancialGraphWorkflow(PydanticAIWorkflow):
         temporal_summarizer_agent,
     ]
 
+    def __init__(self) -> None:
+        # Graph.iter draws snapshot IDs from uuid.uuid4(), which breaks replay;
+        # this runner uses workflow.uuid4()/workflow.now() instead.
+        self.runner = WorkflowGraphRunner("financial_in_workflow")
+
     @workflow.run
-    async def run(self, user_query: str) -> str:
-        # Create the initial state
-        state = CompanyState(user_query=user_query)
-        
-        # Build the graph
-        g = Graph(
-            nodes=(CompanyNameResolver, BalanceSheetAndCashflow, Summarizer)
-        )
-        
-        # Execute the graph within the Temporal workflow
+    async def run(self, user_query: str, checkpoint: GraphCheckpoint | None = None) -> str:
         workflow.logger.info(f"Starting graph execution for query: {user_query}")
         
-        async with g.iter(CompanyNameResolver(), state=state) as run:
-            async for node in run:
-                workflow.logger.info(f"Executed node: {type(node).__name__}")
+        # Execute the graph within the Temporal workflow, continuing-as-new from a checkpoint when history grows
+        result = await self.runner.run(
+            CompanyNameResolver(),
+            CompanyState(user_query=user_query),
+            resume=checkpoint,
+            continue_as_new_args=lambda checkpoint: [user_query, checkpoint],
+        )
         
         workflow.logger.info("Graph execution completed")
-        return run.result.response
+        return result.response
+
+    @workflow.query
+    def current_checkpoint(self) -> GraphCheckpoint | None:
+        """Latest graph checkpoint: the node about to run and the state before it."""
+        return self.runner.checkpoint
 
 # =====================================================================
 # MAIN
 # =====================================================================
 
 async def main():
-    client = await Client.connect("localhost:7233", plugins=[PydanticAIPlugin()])
+    client = await Client.connect("localhost:7233", plugins=[PydanticAIPlugin(), PayloadCompressionPlugin()])
     
     async with Worker(
         client,
@@ -0,0 +1,354 @@
+"""
+Run a pydantic-graph durably under Temporal.
+
+Two modes share the graph registry and JSON node/state encoding:
+
+``execute_graph`` runs one activity per node. The workflow only sequences
+nodes; every node's ``run`` executes in the ``run_graph_node`` activity, with
+node and state passed as JSON. Completed activities are recorded in the
+workflow history, so a retry or worker restart resumes at the failed node
+instead of re-running the whole graph. ``FanOutNode`` branches each run as
+their own ``run_graph_branch`` activity, concurrently, and the node's
+``next_node`` is evaluated in the workflow.
+
+Activity IDs are ``<workflow id>/<step>-<node id>[/<branch>]``, so they are
+stable across replays and easy to find in the Temporal UI.
+
+    graph = register_graph("financial", Graph(nodes=(...)))
+
+    @workflow.run
+    async def run(self, user_query: str) -> str:
+        result = await execute_graph("financial", CompanyNameResolver(), CompanyState(user_query))
+        return result.response
+
+Workers must register ``GRAPH_ACTIVITIES``.
+
+``WorkflowGraphRunner`` runs nodes inside the workflow itself, for graphs
+whose nodes only do workflow-safe I/O (``TemporalAgent`` calls, activities),
+with checkpoints and continue-as-new for deep graphs.
+"""
+import asyncio
+import itertools
+import os
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable
+
+from pydantic import TypeAdapter
+from pydantic_graph import BaseNode, End, Graph, GraphRunContext
+from temporalio import activity, workflow
+from temporalio.common import RetryPolicy
+from temporalio.exceptions import ActivityError, ApplicationError, TimeoutError as TemporalTimeoutError
+from temporalio.workflow import ActivityConfig
+
+from fanout import FANOUT_MAX_CONCURRENCY, BranchError, FanOutNode, FanOutResult, branch_timeout
+from metrics import timed_node
+
+# Read at import: the workflow sandbox forbids os calls while a workflow runs.
+GRAPH_NODE_MAX_ATTEMPTS = int(os.getenv("GRAPH_NODE_MAX_ATTEMPTS", "3"))
+
+# Nodes one workflow run executes before continuing-as-new with a checkpoint.
+GRAPH_MAX_STEPS_PER_RUN = int(os.getenv("GRAPH_MAX_STEPS_PER_RUN", "100"))
+
+# Task queue for node activities, e.g. one served by LLM-bound workers; unset = the workflow's own.
+GRAPH_ACTIVITY_TASK_QUEUE = os.getenv("GRAPH_ACTIVITY_TASK_QUEUE") or None
+
+# Per-attempt limit for TemporalAgent model and tool activities (pydantic-ai's default).
+AGENT_ACTIVITY_TIMEOUT_SECONDS = float(os.getenv("AGENT_ACTIVITY_TIMEOUT_SECONDS", "60"))
+
+# Graphs runnable by the activities, keyed by the name workflows refer to them by.
+GRAPHS: dict[str, Graph] = {}
+
+
+def register_graph(name: str, graph: Graph) -> Graph:
+    """Make ``graph`` available to ``execute_graph`` and the node activities under ``name``."""
+    GRAPHS[name] = graph
+    return graph
+
+
+# ============================================================================
+# Activity Payloads
+# ============================================================================
+
+@dataclass
+class NodeStep:
+    """A node to run: which graph, which node class, and its fields and the state as JSON."""
+    graph: str
+    node: str
+    node_data: dict
+    state: dict
+    branch: str | None = None
+
+
+@dataclass
+class NodeOutcome:
+    """The node that comes next (None once the graph ended), the updated state and any end output."""
+    node: str | None
+    node_data: dict | None
+    state: dict
+    output: Any = None
+
+
+@dataclass
+class NodeActivityOptions:
+    """Timeouts, retries and task queue for node activities."""
+    start_to_close_timeout: timedelta = timedelta(minutes=5)
+    maximum_attempts: int = GRAPH_NODE_MAX_ATTEMPTS
+    task_queue: str | None = GRAPH_ACTIVITY_TASK_QUEUE
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return RetryPolicy(maximum_attempts=self.maximum_attempts)
+
+
+def agent_activity_config() -> ActivityConfig:
+    """
+    ``activity_config`` for TemporalAgents called from workflow code.
+
+    Sends their model and tool activities to ``GRAPH_ACTIVITY_TASK_QUEUE``
+    along with the node activities, so a ``--queue NAME:activities`` worker
+    serves every LLM call; unset keeps them on the workflow's own queue.
+    """
+    config = ActivityConfig(start_to_close_timeout=timedelta(seconds=AGENT_ACTIVITY_TIMEOUT_SECONDS))
+    if GRAPH_ACTIVITY_TASK_QUEUE:
+        config["task_queue"] = GRAPH_ACTIVITY_TASK_QUEUE
+    return config
+
+
+def _dump(value: Any) -> Any:
+    return TypeAdapter(type(value)).dump_python(value, mode="json")
+
+
+def _load(cls: type, data: Any) -> Any:
+    return TypeAdapter(cls).validate_python(data)
+
+
+def _restore(step: NodeStep) -> tuple[Graph, BaseNode, GraphRunContext]:
+    graph = GRAPHS[step.graph]
+    state_type, _ = graph.inferred_types
+    node = _load(graph.node_defs[step.node].node, step.node_data)
+    return graph, node, GraphRunContext(state=_load(state_type, step.state), deps=None)
+
+
+# ============================================================================
+# Activities
+# ============================================================================
+
+@activity.defn
+async def run_graph_node(step: NodeStep) -> NodeOutcome:
+    """Run one graph node and report where the graph goes next."""
+    _, node, ctx = _restore(step)
+    with timed_node(step.node):
+        next_node = await node.run(ctx)
+    if isinstance(next_node, End):
+        return NodeOutcome(node=None, node_data=None, state=_dump(ctx.state), output=_dump(next_node.data))
+    return NodeOutcome(
+        node=next_node.get_node_id(), node_data=_dump(next_node), state=_dump(ctx.state)
+    )
+
+
+@activity.defn
+async def run_graph_branch(step: NodeStep) -> Any:
+    """Run one branch of a FanOutNode; the result must be JSON-serialisable."""
+    _, node, ctx = _restore(step)
+    branch = next(branch for branch in node.branches(ctx) if branch.name == step.branch)
+    with timed_node(f"{step.node}/{branch.name}"):
+        return await branch.call()
+
+
+GRAPH_ACTIVITIES = [run_graph_node, run_graph_branch]
+
+
+# ============================================================================
+# Workflow-side Executor
+# ============================================================================
+
+def _branch_error(name: str, error: ActivityError) -> BranchError:
+    cause = error.cause
+    if isinstance(cause, TemporalTimeoutError):
+        return BranchError(name, "TimeoutError", str(cause), timed_out=True)
+    if isinstance(cause, ApplicationError):
+        return BranchError(name, cause.type or "ApplicationError", cause.message)
+    return BranchError(name, type(cause or error).__name__, str(cause or error))
+
+
+async def _run_fan_out(
+    node: FanOutNode, step: NodeStep, ctx: GraphRunContext, activity_id: str, options: NodeActivityOptions
+) -> FanOutResult:
+    limit = node.max_concurrency if node.max_concurrency is not None else FANOUT_MAX_CONCURRENCY
+    branches = node.branches(ctx)
+    semaphore = asyncio.Semaphore(limit if limit > 0 else max(len(branches), 1))
+    outcome = FanOutResult()
+
+    async def run_branch(branch) -> None:
+        timeout = branch_timeout(branch, node.timeout_seconds)
+        async with semaphore:
+            try:
+                outcome.results[branch.name] = await workflow.execute_activity(
+                    run_graph_branch,
+                    NodeStep(step.graph, step.node, step.node_data, step.state, branch=branch.name),
+                    activity_id=f"{activity_id}/{branch.name}",
+                    task_queue=options.task_queue,
+                    # The branch deadline bounds all attempts, like fan_out's wait_for; without
+                    # one, each attempt is bounded like a node activity.
+                    schedule_to_close_timeout=timedelta(seconds=timeout) if timeout is not None else None,
+                    start_to_close_timeout=options.start_to_close_timeout if timeout is None else None,
+                    retry_policy=options.retry_policy,
+                )
+            except ActivityError as e:
+                outcome.errors[branch.name] = _branch_error(branch.name, e)
+                workflow.logger.warning(f"Fan-out branch failed: {outcome.errors[branch.name]}")
+
+    await asyncio.gather(*(run_branch(branch) for branch in branches))
+    return outcome
+
+
+async def execute_graph(
+    graph_name: str,
+    start_node: BaseNode,
+    state: Any,
+    options: NodeActivityOptions | None = None,
+) -> Any:
+    """
+    Run a registered graph from inside a workflow, one activity per node.
+
+    Args:
+        graph_name: Name the graph was registered under
+        start_node: First node to run
+        state: Initial graph state; must be serialisable by pydantic
+        options: Activity timeouts and retries
+
+    Returns:
+        The graph's end output, validated as the graph's run end type
+    """
+    graph = GRAPHS[graph_name]
+    state_type, end_type = graph.inferred_types
+    options = options or NodeActivityOptions()
+    workflow_id = workflow.info().workflow_id
+    node = start_node
+
+    for index in itertools.count():
+        node_id = node.get_node_id()
+        activity_id = f"{workflow_id}/{index}-{node_id}"
+        step = NodeStep(graph_name, node_id, _dump(node), _dump(state))
+        workflow.logger.info(f"Running graph node {activity_id}")
+
+        if isinstance(node, FanOutNode):
+            ctx = GraphRunContext(state=state, deps=None)
+            next_node = node.next_node(ctx, await _run_fan_out(node, step, ctx, activity_id, options))
+            if isinstance(next_node, End):
+                return next_node.data
+            node = next_node
+            continue
+
+        outcome: NodeOutcome = await workflow.execute_activity(
+            run_graph_node,
+            step,
+            activity_id=activity_id,
+            task_queue=options.task_queue,
+            start_to_close_timeout=options.start_to_close_timeout,
+            retry_policy=options.retry_policy,
+            result_type=NodeOutcome,
+        )
+        state = _load(state_type, outcome.state)
+        if outcome.node is None:
+            # Pass run_end_type to Graph when the nodes don't declare it.
+            return _load(end_type, outcome.output) if end_type is not None else outcome.output
+        node = _load(graph.node_defs[outcome.node].node, outcome.node_data)
+
+
+# ============================================================================
+# In-workflow Runner
+# ============================================================================
+
+@dataclass
+class GraphCheckpoint:
+    """Compact snapshot of a graph run: the next node to execute and the state before it."""
+    graph: str
+    node: str
+    node_data: dict
+    state: dict
+    step: int
+    snapshot_id: str
+    created_at: str
+
+
+class WorkflowGraphRunner:
+    """
+    Runs a registered graph's nodes directly inside a workflow, deterministically.
+
+    Unlike ``Graph.iter``, no snapshot IDs come from ``uuid.uuid4()`` and no
+    timestamps from the wall clock: both come from ``workflow.uuid4()`` and
+    ``workflow.now()``. Nodes must themselves be workflow-safe, e.g. by doing
+    their I/O through ``TemporalAgent`` or activities.
+
+    A ``GraphCheckpoint`` is taken before every node. After
+    ``max_steps_per_run`` nodes, or when Temporal suggests it, the workflow
+    continues-as-new from that checkpoint, so history (and replay cost) stays
+    bounded however deep the graph goes.
+    """
+
+    def __init__(self, graph_name: str, max_steps_per_run: int = GRAPH_MAX_STEPS_PER_RUN):
+        self.graph_name = graph_name
+        self.graph = GRAPHS[graph_name]
+        self.max_steps_per_run = max_steps_per_run
+        self.checkpoint: GraphCheckpoint | None = None
+
+    def take_checkpoint(self, node: BaseNode, state: Any, step: int) -> GraphCheckpoint:
+        node_id = node.get_node_id()
+        self.checkpoint = GraphCheckpoint(
+            graph=self.graph_name,
+            node=node_id,
+            node_data=_dump(node),
+            state=_dump(state),
+            step=step,
+            snapshot_id=f"{node_id}:{workflow.uuid4().hex}",
+            created_at=workflow.now().isoformat(),
+        )
+        return self.checkpoint
+
+    def restore(self, checkpoint: GraphCheckpoint) -> tuple[BaseNode, Any]:
+        state_type, _ = self.graph.inferred_types
+        return _load(self.graph.node_defs[checkpoint.node].node, checkpoint.node_data), _load(state_type, checkpoint.state)
+
+    async def run(
+        self,
+        start_node: BaseNode | None = None,
+        state: Any = None,
+        resume: GraphCheckpoint | None = None,
+        continue_as_new_args: Callable[[GraphCheckpoint], list] | None = None,
+    ) -> Any:
+        """
+        Run the graph to its end, continuing-as-new when this run gets long.
+
+        Args:
+            start_node: First node; ignored when resuming
+            state: Initial state; ignored when resuming
+            resume: Checkpoint passed in by a previous run's continue-as-new
+            continue_as_new_args: Builds the workflow's run arguments from a checkpoint;
+                without it the run never continues-as-new
+
+        Returns:
+            The data of the graph's ``End`` node
+        """
+        step = 0
+        if resume is not None:
+            start_node, state = self.restore(resume)
+            step = resume.step
+            workflow.logger.info(f"Resuming graph {self.graph_name} at step {step} ({resume.node})")
+        node = start_node
+        steps_this_run = 0
+
+        while True:
+            checkpoint = self.take_checkpoint(node, state, step)
+            if continue_as_new_args is not None and steps_this_run and (
+                steps_this_run >= self.max_steps_per_run or workflow.info().is_continue_as_new_suggested()
+            ):
+                workflow.logger.info(f"Continuing graph {self.graph_name} as new at step {step}")
+                workflow.continue_as_new(args=continue_as_new_args(checkpoint))
+
+            node = await node.run(GraphRunContext(state=state, deps=None))
+            step += 1
+            steps_this_run += 1
+            if isinstance(node, End):
+                return node.data
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import timedelta
 import asyncio
 import time
@@ -7,7 +7,16 @@ from temporalio import workflow, activity
 from temporalio.client import Client
 from temporalio.worker import Worker
 from pydantic_ai import Agent, RunContext
+from model_registry import get_model
+from statement_store import lookup_statement
+from symbol_index import get_symbol_index
 from pydantic_ai.models.openai import OpenAIModel
+from fanout import Branch, FanOutNode, FanOutResult
+from financial_metrics import metrics_record
+from handoff import StatementFigures, handoff_serializer
+from payload_codec import PayloadCompressionPlugin
+from tool_resilience import resilient_tool
+from temporal_graph_executor import GRAPH_ACTIVITIES, execute_graph, register_graph
 from pydantic_graph import BaseNode, Graph, End, GraphRunContext, GraphRunResult
 from pydantic_ai.durable_exec.temporal import TemporalAgent, PydanticAIWorkflow, PydanticAIPlugin
 
@@ -42,7 +51,7 @@ class FinalResult:
 # AGENTS (Same as before)
 # =====================================================================
 company_name_provider_agent = Agent(
-    model="gpt-4o",
+    model=get_model("gpt-4o"),
     name="company_name_provider_agent",
     system_prompt="Get the company symbol from the query.",
     output_type=CompanySymbol,
@@ -50,17 +59,24 @@ company_name_provider_agent = Agent(
 
 @company_name_provider_agent.tool
 async def get_company_name(ctx: RunContext[None], company_name: str):
+    match = get_symbol_index().lookup(company_name)
+    if match and match.confident:
+        return CompanySymbol(symbol=match.symbol)
     return CompanySymbol(symbol="RELIANCE.NS")
 
 balance_sheet_agent = Agent(
-    model="gpt-4o",
+    model=get_model("gpt-4o"),
     name="balance_sheet_agent",
     system_prompt="Return the balance sheet data. Use the tool provided.",
     output_type=FinancialData
 )
 
 @balance_sheet_agent.tool
+@resilient_tool("balance_sheet")
 async def get_balance_sheet(ctx: RunContext[None], symbol: str) -> dict:
+    stored = lookup_statement("balance_sheet", symbol)
+    if stored is not None:
+        return stored
     return {
         "type": "balance_sheet",
         "symbol": symbol,
@@ -69,14 +85,18 @@ async def get_balance_sheet(ctx: RunContext[None], symbol: str) -> dict:
     }
 
 cash_flow_agent = Agent(
-    model="gpt-4o",
+    model=get_model("gpt-4o"),
     name="cash_flow_agent",
     system_prompt="Return the cash flow data. Use the tool provided.",
     output_type=FinancialData
 )
 
 @cash_flow_agent.tool
+@resilient_tool("cash_flow")
 async def get_cash_flow(ctx: RunContext[None], symbol: str) -> dict:
+    stored = lookup_statement("cash_flow", symbol)
+    if stored is not None:
+        return stored
     return {
         "type": "cash_flow",
         "symbol": symbol,
@@ -85,7 +105,7 @@ async def get_cash_flow(ctx: RunContext[None], symbol: str) -> dict:
     }
 
 summarizer_agent = Agent(
-    model="gpt-4o",
+    model=get_model("gpt-4o"),
     name="summarizer_agent",
     system_prompt="Summarize the provided financial information into a brief paragraph."
 )
@@ -102,48 +122,62 @@ temporal_summarizer_agent = TemporalAgent(summarizer_agent)
 @dataclass
 class CompanyNameResolver(BaseNode[CompanyState]):
     async def run(self, ctx: GraphRunContext[CompanyState]) -> "BalanceSheetAndCashflow":
+        # This node runs inside the run_graph_node activity, so a local lookup is safe here.
+        match = get_symbol_index().resolve_query(ctx.state.user_query)
+        if match and match.confident:
+            return BalanceSheetAndCashflow(symbol=match.symbol)
         result = await temporal_company_agent.run(ctx.state.user_query)
         return BalanceSheetAndCashflow(symbol=result.output.symbol)
 
+async def fetch_data(agent: TemporalAgent, prompt: str) -> dict:
+    """Run a data agent and keep only its serialisable payload."""
+    result = await agent.run(prompt)
+    return result.output.data
+
 @dataclass
-class BalanceSheetAndCashflow(BaseNode[CompanyState]):
+class BalanceSheetAndCashflow(FanOutNode[CompanyState]):
     symbol: str
+
+    def branches(self, ctx: GraphRunContext[CompanyState]) -> list[Branch]:
+        return [
+            Branch("balance_sheet", lambda: fetch_data(temporal_balance_agent, f"This is the symbol of the company {self.symbol}.")),
+            Branch("cash_flow", lambda: fetch_data(temporal_cashflow_agent, f"This is the symbol of the company {self.symbol}.")),
+        ]
     
+    def next_node(self, ctx: GraphRunContext[CompanyState], outcome: FanOutResult) -> "Summarizer":
+        # A failed or timed-out branch is passed on as an error instead of failing the graph.
+        records = {name: StatementFigures.from_dict(outcome.get(name), name) for name in ("balance_sheet", "cash_flow")}
+        errors = [str(error) for error in outcome.errors.values()]
+        errors += [f"{name}: no figures returned" for name, record in records.items() if record is None and name not in outcome.errors]
+        return Summarizer(balance_sheet=records["balance_sheet"], cash_flow=records["cash_flow"], errors=errors)
+
     async def run(self, ctx: GraphRunContext[CompanyState]) -> "Summarizer":
-        balance, cashflow = await asyncio.gather(
-            temporal_balance_agent.run(f"This is the symbol of the company {self.symbol}."),
-            temporal_cashflow_agent.run(f"This is the symbol of the company {self.symbol}.")
-        )
-        return Summarizer(
-            balance_sheet_info=str(balance.output.data),
-            cash_flow_info=str(cashflow.output.data)
-        )
+        return self.next_node(ctx, await self.fan_out(ctx))
 
 @dataclass
 class Summarizer(BaseNode[CompanyState]):
-    balance_sheet_info: str
-    cash_flow_info: str
+    balance_sheet: StatementFigures | None
+    cash_flow: StatementFigures | None
+    errors: list[str] = field(default_factory=list)
     
     async def run(self, ctx: GraphRunContext[CompanyState]) -> End[FinalResult]:
-        result = await temporal_summarizer_agent.run(
-            f"The balance sheet is {self.balance_sheet_info} and the cash flow is {self.cash_flow_info}"
+        # Runs in the node activity, so numpy is fine here; ratios come precomputed.
+        metrics = metrics_record(self.balance_sheet, self.cash_flow)
+        prompt = "Figures (K/M/B/T = thousand/million/billion/trillion):\n" + handoff_serializer.render(
+            [self.balance_sheet, self.cash_flow, metrics], self.errors
         )
+        if self.errors:
+            prompt += "\nSay briefly which data could not be fetched."
+        result = await temporal_summarizer_agent.run(prompt)
         return End(FinalResult(response=result.output))
 
 # =====================================================================
-# ACTIVITY: Execute graph (wraps non-deterministic uuid.uuid4 calls)
+# GRAPH: each node runs as its own activity (see temporal_graph_executor)
 # =====================================================================
-@activity.defn
-async def execute_graph_activity(user_query: str) -> str:
-    """
-    Wraps the entire graph execution as an activity.
-    This isolates the non-deterministic uuid.uuid4() calls used by PydanticGraph.
-    """
-    state = CompanyState(user_query=user_query)
-    g = Graph(nodes=(CompanyNameResolver, BalanceSheetAndCashflow, Summarizer))
-    
-    result : GraphRunResult = await g.run(CompanyNameResolver(), state=state)
-    return result.output
+financial_graph = register_graph(
+    "financial",
+    Graph(nodes=(CompanyNameResolver, BalanceSheetAndCashflow, Summarizer), run_end_type=FinalResult),
+)
 
 # =====================================================================
 # TEMPORAL WORKFLOW WITH PYDANTIC GRAPH
@@ -151,8 +185,8 @@ async def execute_graph_activity(user_query: str) -> str:
 @workflow.defn
 class FinancialGraphWorkflow(PydanticAIWorkflow):
     """
-    This workflow executes the PydanticGraph via an activity wrapper.
-    The activity isolates non-deterministic operations (uuid.uuid4) from the workflow.
+    This workflow walks the PydanticGraph node by node, running each node as an activity.
+    A failed node is retried on its own; nodes that already completed are never re-run.
     """
     
     __pydantic_ai_agents__ = [
@@ -166,15 +200,10 @@ class FinancialGraphWorkflow(PydanticAIWorkflow):
     async def run(self, user_query: str) -> str:
         workflow.logger.info(f"Starting graph execution for query: {user_query}")
         
-        # Execute the graph as an activity to avoid non-deterministic uuid.uuid4 calls
-        result = await workflow.execute_activity(
-            execute_graph_activity,
-            user_query,
-            start_to_close_timeout=timedelta(minutes=5),
-        )
+        result = await execute_graph("financial", CompanyNameResolver(), CompanyState(user_query=user_query))
         
         workflow.logger.info("Graph execution completed")
-        return result
+        return result.response
 
 # =====================================================================
 # MAIN EXECUTION
@@ -184,14 +213,14 @@ async def main():
     This is how you run it - clean and simple!
     The graph structure is preserved while getting Temporal's durability.
     """
-    client = await Client.connect("localhost:7233", plugins=[PydanticAIPlugin()])
+    client = await Client.connect("localhost:7233", plugins=[PydanticAIPlugin(), PayloadCompressionPlugin()])
     
     # Start worker
     async with Worker(
         client,
         task_queue="financial-graph-queue-2",
         workflows=[FinancialGraphWorkflow],
-        activities=[execute_graph_activity],
+        activities=GRAPH_ACTIVITIES,
     ):
         print("Worker started. Executing PydanticGraph via Temporal...")
         
@@ -217,10 +246,8 @@ async def run_graph_standalone():
     state = CompanyState(
         user_query="Whats the balance sheet and cash flow of Reliance digital"
     )
-    g = Graph(nodes=(CompanyNameResolver, BalanceSheetAndCashflow, Summarizer))
-    
-    result = await g.run(CompanyNameResolver(), state=state)
-    print(f"Standalone Result: {result.response}")
+    result = await financial_graph.run(CompanyNameResolver(), state=state)
+    print(f"Standalone Result: {result.output.response}")
 
 if __name__ == "__main__":
     import sys
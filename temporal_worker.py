@@ -1,19 +1,244 @@
+"""
+Temporal worker entry point for the financial graph workflows.
+
+Each ``--queue NAME[:ROLE]`` starts one Worker in every process:
+
+    workflows   workflow tasks only (the cheap, deterministic part)
+    activities  graph node and agent activities (the LLM-bound part)
+    all         both (default)
+
+so one host can poll a deterministic queue and an LLM queue with separate
+concurrency limits, and ``--processes`` runs N identical worker processes to
+scale LLM-bound activity throughput past one event loop.
+
+Set ``GRAPH_ACTIVITY_TASK_QUEUE`` on the workflow workers to route activities
+to the LLM queue: node activities for the ``per_node`` graph (whose agents run
+inside them), and the agents' model and tool activities for ``in_workflow``.
+Without it every activity stays on the workflow's own queue.
+
+Workflow workers also run ``PortfolioWorkflow``.
+
+SIGINT/SIGTERM stop polling and let running tasks finish for up to
+``--graceful-shutdown-seconds``.
+
+    python temporal_worker.py
+    python temporal_worker.py --graph per_node --queue graph-workflows:workflows \\
+        --queue graph-llm:activities --max-concurrent-activities 200 --processes 4
+"""
+import argparse
 import asyncio
+import importlib
+import importlib.util
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+
 from temporalio.client import Client
 from temporalio.worker import Worker
+from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner, SandboxRestrictions
+
+from payload_codec import PayloadCompressionPlugin
+from portfolio_workflow import PortfolioWorkflow
+
+ROOT = Path(__file__).resolve().parent
+
+logger = logging.getLogger(__name__)
+
+ROLES = ("workflows", "activities", "all")
+
+# Graph flavours: module defining FinancialGraphWorkflow, and its default task queue.
+GRAPHS = {
+    "per_node": ("temporal_graph_run1", "financial-graph-queue-2"),
+    "in_workflow": ("temporal-graph", "financial-graph-1"),
+}
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+@dataclass
+class QueueSpec:
+    """A task queue to poll and which kinds of tasks to accept from it."""
+    name: str
+    role: str = "all"
+
+    @classmethod
+    def parse(cls, value: str) -> "QueueSpec":
+        name, _, role = value.partition(":")
+        role = role or "all"
+        if role not in ROLES:
+            raise argparse.ArgumentTypeError(f"unknown role {role!r}, expected one of {', '.join(ROLES)}")
+        return cls(name, role)
+
+
+@dataclass
+class WorkerSettings:
+    """Everything a worker process needs; picklable so it can be sent to child processes."""
+    graph: str = "per_node"
+    queues: list[QueueSpec] = field(default_factory=list)
+    address: str = "localhost:7233"
+    namespace: str = "default"
+    max_concurrent_activities: int = 100
+    max_concurrent_workflow_tasks: int = 100
+    max_activity_pollers: int = 5
+    max_workflow_pollers: int = 5
+    graceful_shutdown_seconds: float = 30.0
+
+
+def load_graph_module(graph: str):
+    """Import the module defining the workflow for ``graph`` (``temporal-graph.py`` needs a path import)."""
+    module_name, _ = GRAPHS[graph]
+    if module_name.isidentifier():
+        return importlib.import_module(module_name)
+    spec = importlib.util.spec_from_file_location(module_name.replace("-", "_"), ROOT / f"{module_name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# ============================================================================
+# Workers
+# ============================================================================
+
+def build_worker(client: Client, module, queue: QueueSpec, settings: WorkerSettings) -> Worker:
+    """Create the Worker for one queue, registering what its role calls for."""
+    workflow_class = module.FinancialGraphWorkflow
+    workflows, activities = [], []
+    if queue.role in ("workflows", "all"):
+        # PydanticAIPlugin adds the workflow's agent activities to this worker too.
+        workflows.extend([workflow_class, PortfolioWorkflow])
+    if queue.role in ("activities", "all"):
+        activities.extend(getattr(module, "GRAPH_ACTIVITIES", []))
+        if queue.role == "activities":
+            for agent in workflow_class.__pydantic_ai_agents__:
+                activities.extend(agent.temporal_activities)
 
-from test.temporal_main import BaseWorkflow, print_name
-# ...
-# ...
-async def main():
-    client = await Client.connect("localhost:7233")
-    worker = Worker(
+    runner = SandboxedWorkflowRunner()
+    if module.__name__ != GRAPHS[settings.graph][0]:
+        # Loaded from a file path under another name, so the sandbox can't re-import it.
+        runner = SandboxedWorkflowRunner(
+            restrictions=SandboxRestrictions.default.with_passthrough_modules(module.__name__)
+        )
+
+    return Worker(
         client,
-        task_queue="your-task-queue",
-        workflows=[BaseWorkflow],
-        activities=[print_name],
+        task_queue=queue.name,
+        workflows=workflows,
+        activities=activities,
+        workflow_runner=runner,
+        max_concurrent_activities=settings.max_concurrent_activities,
+        max_concurrent_workflow_tasks=settings.max_concurrent_workflow_tasks,
+        max_concurrent_activity_task_polls=settings.max_activity_pollers,
+        max_concurrent_workflow_task_polls=settings.max_workflow_pollers,
+        graceful_shutdown_timeout=timedelta(seconds=settings.graceful_shutdown_seconds),
+    )
+
+
+async def run_workers(settings: WorkerSettings) -> None:
+    """Run one Worker per queue until SIGINT/SIGTERM, then shut them down gracefully."""
+    from pydantic_ai.durable_exec.temporal import PydanticAIPlugin
+
+    module = load_graph_module(settings.graph)
+    client = await Client.connect(
+        settings.address, namespace=settings.namespace, plugins=[PydanticAIPlugin(), PayloadCompressionPlugin()]
     )
-    await worker.run()
+    workers = [build_worker(client, module, queue, settings) for queue in settings.queues]
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    runs = [asyncio.create_task(worker.run()) for worker in workers]
+    stopping = asyncio.create_task(stop.wait())
+    queues = ", ".join(f"{queue.name}:{queue.role}" for queue in settings.queues)
+    logger.info(f"Worker {os.getpid()} polling {queues}")
+    try:
+        # A worker that dies (e.g. lost connection) brings the process down too.
+        await asyncio.wait([stopping, *runs], return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        stopping.cancel()
+        logger.info(f"Worker {os.getpid()} shutting down")
+        await asyncio.gather(*(worker.shutdown() for worker in workers), return_exceptions=True)
+        for run in runs:
+            if run.done() and not run.cancelled() and run.exception() is not None:
+                raise run.exception()
+
+
+def worker_process(settings: WorkerSettings) -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_workers(settings))
+
+
+def run_processes(settings: WorkerSettings, processes: int) -> int:
+    """Run ``processes`` worker processes, forwarding SIGINT/SIGTERM and waiting for them to drain."""
+    context = multiprocessing.get_context("spawn")
+    children = [context.Process(target=worker_process, args=(settings,), name=f"worker-{i}") for i in range(processes)]
+    for child in children:
+        child.start()
+
+    def forward(signum, frame):
+        for child in children:
+            if child.is_alive() and child.pid is not None:
+                os.kill(child.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, forward)
+    signal.signal(signal.SIGTERM, forward)
+    for child in children:
+        child.join()
+    return max((child.exitcode or 0 for child in children), default=0)
+
+
+# ============================================================================
+# Entry Point
+# ============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graph", choices=list(GRAPHS), default=os.getenv("TEMPORAL_GRAPH", "per_node"))
+    parser.add_argument(
+        "--queue", dest="queues", type=QueueSpec.parse, action="append",
+        help="NAME[:workflows|activities|all], repeatable (default: the graph's own queue, all)",
+    )
+    parser.add_argument("--address", default=os.getenv("TEMPORAL_ADDRESS", "localhost:7233"))
+    parser.add_argument("--namespace", default=os.getenv("TEMPORAL_NAMESPACE", "default"))
+    parser.add_argument(
+        "--max-concurrent-activities", type=int, default=int(os.getenv("TEMPORAL_MAX_CONCURRENT_ACTIVITIES", "100"))
+    )
+    parser.add_argument(
+        "--max-concurrent-workflow-tasks", type=int, default=int(os.getenv("TEMPORAL_MAX_CONCURRENT_WORKFLOW_TASKS", "100"))
+    )
+    parser.add_argument("--max-activity-pollers", type=int, default=int(os.getenv("TEMPORAL_MAX_ACTIVITY_POLLERS", "5")))
+    parser.add_argument("--max-workflow-pollers", type=int, default=int(os.getenv("TEMPORAL_MAX_WORKFLOW_POLLERS", "5")))
+    parser.add_argument("--processes", type=int, default=int(os.getenv("TEMPORAL_WORKER_PROCESSES", "1")))
+    parser.add_argument(
+        "--graceful-shutdown-seconds", type=float, default=float(os.getenv("TEMPORAL_GRACEFUL_SHUTDOWN_SECONDS", "30"))
+    )
+    args = parser.parse_args()
+
+    settings = WorkerSettings(
+        graph=args.graph,
+        queues=args.queues or [QueueSpec(GRAPHS[args.graph][1])],
+        address=args.address,
+        namespace=args.namespace,
+        max_concurrent_activities=args.max_concurrent_activities,
+        max_concurrent_workflow_tasks=args.max_concurrent_workflow_tasks,
+        max_activity_pollers=args.max_activity_pollers,
+        max_workflow_pollers=args.max_workflow_pollers,
+        graceful_shutdown_seconds=args.graceful_shutdown_seconds,
+    )
+    if args.processes > 1:
+        return run_processes(settings, args.processes)
+    worker_process(settings)
+    return 0
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import os
+
+# Agents are built with real model clients; keep them offline and uninstrumented.
+os.environ.setdefault("LOGFIRE_ENABLED", "0")
+os.environ.setdefault("OPENAI_API_KEY", "test")
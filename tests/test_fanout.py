@@ -0,0 +1,35 @@
+import asyncio
+
+from fanout import Branch, fan_out
+
+
+async def _sleep(seconds: float) -> str:
+    await asyncio.sleep(seconds)
+    return "done"
+
+
+async def _raise_timeout() -> None:
+    raise TimeoutError("upstream read timed out")
+
+
+def test_branch_over_deadline_is_timed_out():
+    outcome = asyncio.run(fan_out([Branch("slow", lambda: _sleep(1)), Branch("fast", lambda: _sleep(0))], timeout_seconds=0.05))
+
+    assert outcome.results == {"fast": "done"}
+    assert outcome.errors["slow"].timed_out
+    assert outcome.errors["slow"].message == "no result within 0.05s"
+
+
+def test_branch_raising_timeout_error_is_not_timed_out():
+    outcome = asyncio.run(fan_out([Branch("flaky", _raise_timeout)], timeout_seconds=5))
+
+    error = outcome.errors["flaky"]
+    assert not error.timed_out
+    assert (error.error_type, error.message) == ("TimeoutError", "upstream read timed out")
+
+
+def test_branch_raising_timeout_error_without_deadline():
+    outcome = asyncio.run(fan_out([Branch("flaky", _raise_timeout)], timeout_seconds=0))
+
+    assert not outcome.errors["flaky"].timed_out
+    assert outcome.errors["flaky"].message == "upstream read timed out"
@@ -0,0 +1,74 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from pydantic_ai.models.test import TestModel
+
+import main
+from intent_router import Route
+
+
+def test_run_agent_returns_model_output(monkeypatch):
+    monkeypatch.setattr(main, "intent_router", None)
+    monkeypatch.setattr(main, "RUN_AGENT_COALESCING", False)
+    model = TestModel(call_tools=[], custom_output_text="Reliance holds 1.2T in assets.")
+
+    with main.registry.get("main_agent").override(model=model), TestClient(main.app) as client:
+        response = client.post("/run-agent", json={"company": "RELIANCE.NS", "query": "balance sheet"})
+
+    assert response.status_code == 200
+    assert response.json()["result"]["agent_response"] == "Reliance holds 1.2T in assets."
+
+
+def test_routed_run_agent_returns_answer_output(monkeypatch):
+    async def fake_balance_sheet(symbol: str) -> dict:
+        return {"symbol": symbol, "total_assets": 1}
+
+    route = Route("balance_sheet", 1.0, "rules", ("get_balance_sheet",))
+    monkeypatch.setattr(main, "intent_router", type("Router", (), {"route": lambda self, query: route})())
+    monkeypatch.setattr(main, "RUN_AGENT_COALESCING", False)
+    monkeypatch.setitem(main.ROUTED_TOOLS, "get_balance_sheet", fake_balance_sheet)
+    model = TestModel(custom_output_text="Total assets: 1.")
+
+    with main.registry.get("answer_agent").override(model=model), TestClient(main.app) as client:
+        response = client.post("/run-agent", json={"company": "RELIANCE.NS", "query": "balance sheet"})
+
+    assert response.status_code == 200
+    result = response.json()["result"]
+    assert result["agent_response"] == "Total assets: 1."
+    assert result["tool_results"] == {"get_balance_sheet": {"symbol": "RELIANCE.NS", "total_assets": 1}}
+
+
+def test_batch_stream_disconnect_cancels_coalesced_agent_runs(monkeypatch):
+    started: dict[str, asyncio.Event] = {}
+    cancelled: list[str] = []
+
+    async def fake_execute_agent(request: main.AgentRequest) -> main.AgentResponse:
+        started.setdefault(request.company, asyncio.Event()).set()
+        if request.company != "FAST":
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(request.company)
+                raise
+        return main.AgentResponse(status="success", result={"company": request.company})
+
+    monkeypatch.setattr(main, "RUN_AGENT_COALESCING", True)
+    monkeypatch.setattr(main, "execute_agent", fake_execute_agent)
+
+    async def scenario():
+        semaphore = asyncio.Semaphore(4)
+        items = [main.AgentRequest(company=company, query="balance sheet") for company in ("FAST", "SLOW", "SLOW")]
+        tasks = [asyncio.create_task(main.run_batch_item(i, item, semaphore)) for i, item in enumerate(items)]
+        stream = main.stream_batch_results(tasks)
+        first = await anext(stream)
+        # The client disconnects after the first line.
+        await stream.aclose()
+        await asyncio.sleep(0.01)
+        # Checked before asyncio.run cancels whatever is still pending.
+        return first, list(cancelled)
+
+    first, cancelled_runs = asyncio.run(scenario())
+
+    assert '"FAST"' in first
+    # Both SLOW items shared one agent run, which is cancelled rather than left running.
+    assert cancelled_runs == ["SLOW"]
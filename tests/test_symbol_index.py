@@ -0,0 +1,47 @@
+import pytest
+
+from symbol_index import MIN_CONFIDENCE, SymbolIndex, get_symbol_index
+
+
+@pytest.fixture
+def index() -> SymbolIndex:
+    return get_symbol_index()
+
+
+@pytest.mark.parametrize("query, symbol", [
+    ("Reliance Power balance sheet", "RELIANCE.NS"),
+    ("balance sheet of HDFC Life", "HDFCBANK.NS"),
+    ("How are Adani Ports doing?", "ADANIENT.NS"),
+])
+def test_alias_inside_longer_name_is_not_confident(index, query, symbol):
+    match = index.resolve_query(query)
+
+    assert match is not None and match.symbol == symbol
+    assert match.score < MIN_CONFIDENCE
+    assert not match.confident
+
+
+@pytest.mark.parametrize("query, symbol", [
+    ("Whats the balance sheet and cash flow of Reliance digital", "RELIANCE.NS"),
+    ("cash flow of Reliance", "RELIANCE.NS"),
+    ("Show HDFC cash flow", "HDFCBANK.NS"),
+    ("Compare Apple and Microsoft", "AAPL"),
+    ("Reliance Industries Ltd cash flow", "RELIANCE.NS"),
+    ("income statement of Tata Motors", "TATAMOTORS.NS"),
+])
+def test_standalone_alias_is_confident(index, query, symbol):
+    match = index.resolve_query(query)
+
+    assert match is not None and match.symbol == symbol
+    assert match.confident
+
+
+def test_alias_shared_by_several_symbols_is_not_confident():
+    index = SymbolIndex()
+    index.add("TATAMOTORS.NS", "Tata Motors Limited", ["Tata"])
+    index.add("TATASTEEL.NS", "Tata Steel Limited", ["Tata"])
+
+    match = index.resolve_query("cash flow of tata")
+
+    assert match is not None and not match.confident
+    assert index.resolve_query("cash flow of tata steel").symbol == "TATASTEEL.NS"
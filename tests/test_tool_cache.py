@@ -0,0 +1,37 @@
+import asyncio
+
+from tool_cache import AsyncTTLCache
+
+
+async def _run_with_waiters(cancelled: int, total: int) -> tuple[asyncio.Future, list[asyncio.Task]]:
+    cache = AsyncTTLCache(ttl_seconds=0)
+    release = asyncio.Event()
+    fetches: list[asyncio.Future] = []
+
+    async def fetch() -> str:
+        fetches.append(asyncio.current_task())
+        await release.wait()
+        return "value"
+
+    waiters = [asyncio.create_task(cache.get_or_fetch("key", fetch)) for _ in range(total)]
+    await asyncio.sleep(0)
+    for waiter in waiters[:cancelled]:
+        waiter.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    return fetches[0], waiters
+
+
+def test_fetch_survives_while_a_waiter_remains():
+    fetch, waiters = asyncio.run(_run_with_waiters(cancelled=1, total=2))
+
+    assert not fetch.cancelled()
+    assert waiters[1].result() == "value"
+
+
+def test_fetch_is_cancelled_with_its_last_waiter():
+    fetch, waiters = asyncio.run(_run_with_waiters(cancelled=2, total=2))
+
+    assert fetch.cancelled()
+    assert all(waiter.cancelled() for waiter in waiters)
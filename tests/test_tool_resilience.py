@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+from pydantic_ai import ModelRetry
+
+from tool_resilience import circuit_breaker, resilient_tool
+
+
+def test_persistent_failure_returns_tool_error_without_retrying():
+    calls = 0
+
+    @resilient_tool("test_runtime_error", attempts=3, base_delay=0)
+    async def fetch(symbol: str) -> dict:
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("Manual cash flow failure for retry")
+
+    result = asyncio.run(fetch("RELIANCE.NS"))
+
+    assert calls == 1
+    assert result["error"] == "tool_failed"
+    assert result["message"] == "RuntimeError: Manual cash flow failure for retry"
+    assert result["attempts"] == 1
+    assert circuit_breaker("test_runtime_error").failures == 1
+
+
+def test_transient_failure_is_retried():
+    calls = 0
+
+    @resilient_tool("test_transient", attempts=3, base_delay=0)
+    async def fetch(symbol: str) -> dict:
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise ConnectionError("reset by peer")
+        return {"symbol": symbol}
+
+    assert asyncio.run(fetch("INFY.NS")) == {"symbol": "INFY.NS"}
+    assert calls == 3
+    assert circuit_breaker("test_transient").failures == 0
+
+
+def test_model_retry_propagates_without_a_breaker_failure():
+    @resilient_tool("test_model_retry", base_delay=0)
+    async def fetch(symbol: str) -> dict:
+        raise ModelRetry("unknown symbol, pass an exchange suffix")
+
+    with pytest.raises(ModelRetry):
+        asyncio.run(fetch("RELIANCE"))
+    assert circuit_breaker("test_model_retry").failures == 0
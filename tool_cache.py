@@ -0,0 +1,189 @@
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# Async TTL + LRU Cache with Single-Flight
+# ============================================================================
+
+@dataclass
+class CacheStats:
+    """Counters describing how a cache has been used."""
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+
+class AsyncTTLCache:
+    """
+    In-process async cache with per-entry TTL and an LRU size bound.
+
+    Concurrent misses for the same key share one in-flight fetch
+    (single-flight), so a burst of requests for one symbol costs one upstream
+    call. Failed fetches are never cached; every waiter sees the exception.
+    A cancelled caller leaves the fetch running for the others, but when the
+    last one is cancelled the fetch is cancelled too.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 1024, name: str = "cache"):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.name = name
+        self.stats = CacheStats()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        self._waiters: dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Return ``(found, value)`` for a fresh entry, refreshing its LRU position."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entries beyond ``max_entries``."""
+        if self.ttl_seconds <= 0:
+            # Single-flight only: the value would be expired before anyone could read it.
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Drop one key, or every entry when ``key`` is None."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for ``key`` or run ``fetch`` to populate it.
+
+        Args:
+            key: Cache key
+            fetch: Zero-argument coroutine factory producing the value
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        found, value = self.get(key)
+        if found:
+            self.stats.hits += 1
+            return value
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self._in_flight[key] = task
+            task.add_done_callback(functools.partial(self._on_fetch_done, key))
+
+        # Shield so one cancelled caller doesn't cancel the fetch for everyone else.
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1 and not task.done():
+                # The last caller gave up: nobody is left to use the result.
+                logger.debug(f"{self.name}: cancelling unclaimed fetch for {key!r}")
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def _on_fetch_done(self, key: Hashable, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self.stats.errors += 1
+            return
+        self.set(key, task.result())
+
+    def snapshot(self) -> dict:
+        """Return counters and sizes for reporting."""
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "in_flight": len(self._in_flight),
+            "hit_rate": round(self.stats.hit_rate, 4),
+            **asdict(self.stats),
+        }
+
+
+# ============================================================================
+# Shared Financial Statement Cache
+# ============================================================================
+
+financial_data_cache = AsyncTTLCache(
+    ttl_seconds=float(os.getenv("FINANCIAL_CACHE_TTL_SECONDS", "300")),
+    max_entries=int(os.getenv("FINANCIAL_CACHE_MAX_ENTRIES", "1024")),
+    name="financial_data",
+)
+
+
+def cached_statement(statement_type: str, cache: AsyncTTLCache = financial_data_cache):
+    """
+    Cache an async statement fetcher by ``(statement_type, symbol)``.
+
+    Works for plain functions and for agent tools taking a ``RunContext``
+    first, as long as the wrapped function has a ``symbol`` parameter. The
+    original signature and docstring are preserved so tool schemas are
+    unchanged.
+
+    Args:
+        statement_type: Statement kind used in the cache key, e.g. ``"balance_sheet"``
+        cache: Cache instance to use, the shared ``financial_data_cache`` by default
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            # Fetch with the normalized symbol too, so the cached value matches its key.
+            bound.arguments["symbol"] = symbol = bound.arguments["symbol"].strip().upper()
+            key = (statement_type, symbol)
+            return await cache.get_or_fetch(key, lambda: func(*bound.args, **bound.kwargs))
+
+        return wrapper
+
+    return decorator
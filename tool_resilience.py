@@ -0,0 +1,243 @@
+import asyncio
+import functools
+import logging
+import os
+import random
+import time
+from dataclasses import asdict, dataclass
+
+import httpx
+from pydantic_ai import ModelRetry
+
+from metrics import registry as metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Defaults for tools that don't set their own.
+TOOL_RETRY_ATTEMPTS = int(os.getenv("TOOL_RETRY_ATTEMPTS", "3"))
+TOOL_RETRY_BASE_DELAY_SECONDS = float(os.getenv("TOOL_RETRY_BASE_DELAY_SECONDS", "0.2"))
+TOOL_RETRY_MAX_DELAY_SECONDS = float(os.getenv("TOOL_RETRY_MAX_DELAY_SECONDS", "5"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+# Failures worth retrying by default: network trouble and timeouts, not bad input or bugs.
+TRANSIENT_ERRORS: tuple[type[Exception], ...] = (httpx.TransportError, TimeoutError, ConnectionError)
+
+tool_retry_counter = metrics_registry.counter(
+    "tool_retries_total",
+    "Tool calls retried after a transient failure.",
+    ("tool", "upstream"),
+)
+circuit_counter = metrics_registry.counter(
+    "circuit_breaker_events_total",
+    "Circuit breaker events per upstream: opened, half_open, closed, rejected.",
+    ("upstream", "event"),
+)
+
+
+# ============================================================================
+# Circuit Breaker
+# ============================================================================
+
+class CircuitBreaker:
+    """
+    Per-upstream circuit breaker.
+
+    After ``failure_threshold`` consecutive failed calls the circuit opens and
+    calls are rejected without touching the upstream. Once ``reset_seconds``
+    have passed, one trial call is let through (half-open): success closes
+    the circuit, failure opens it for another ``reset_seconds``.
+    """
+
+    def __init__(
+        self,
+        upstream: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds: float = CIRCUIT_RESET_SECONDS,
+    ):
+        self.upstream = upstream
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets a trial call through; 0 when it isn't open."""
+        if self.opened_at is None:
+            return 0.0
+        return max(self.reset_seconds - (time.monotonic() - self.opened_at), 0.0)
+
+    def allow(self) -> bool:
+        """Whether a call may go to the upstream now; claims the trial slot when half-open."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            circuit_counter.inc(upstream=self.upstream, event="half_open")
+            return True
+        circuit_counter.inc(upstream=self.upstream, event="rejected")
+        return False
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info(f"Circuit for {self.upstream} closed")
+            circuit_counter.inc(upstream=self.upstream, event="closed")
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_in_flight or (self.opened_at is None and self.failures >= self.failure_threshold):
+            logger.warning(f"Circuit for {self.upstream} opened after {self.failures} failures")
+            circuit_counter.inc(upstream=self.upstream, event="opened")
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Give back a trial slot whose call ended without a verdict, e.g. was cancelled."""
+        self._trial_in_flight = False
+
+    def snapshot(self) -> dict:
+        return {
+            "upstream": self.upstream,
+            "state": self.state,
+            "failures": self.failures,
+            "retry_after_seconds": round(self.retry_after(), 2),
+        }
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def circuit_breaker(upstream: str) -> CircuitBreaker:
+    """Return the process-wide breaker for ``upstream``, creating it on first use."""
+    if upstream not in _breakers:
+        _breakers[upstream] = CircuitBreaker(upstream)
+    return _breakers[upstream]
+
+
+def circuit_snapshot() -> list[dict]:
+    """Return the state of every breaker for reporting."""
+    return [breaker.snapshot() for breaker in _breakers.values()]
+
+
+# ============================================================================
+# Resilient Tools
+# ============================================================================
+
+@dataclass
+class ToolError:
+    """
+    Structured failure returned to the model instead of raising.
+
+    Raising out of a tool fails the whole agent run (and, under Temporal,
+    retries the agent activity including its LLM calls); returning this lets
+    the model report the missing data and carry on.
+    """
+    error: str
+    upstream: str
+    message: str
+    attempts: int = 0
+    retry_after_seconds: float | None = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in ``[0, min(cap, base * 2**attempt)]``."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def resilient_tool(
+    upstream: str,
+    attempts: int | None = None,
+    base_delay: float | None = None,
+    max_delay: float | None = None,
+    retry_on: tuple[type[Exception], ...] = TRANSIENT_ERRORS,
+):
+    """
+    Retry an async tool locally and guard its upstream with a circuit breaker.
+
+    Transient failures (``retry_on``) are retried with jittered exponential
+    backoff; any other exception fails the call at once. Either way the
+    breaker counts the failure, and once the tool gives up, or the upstream's
+    circuit is open, it returns a ``ToolError`` dict the model can reason
+    about rather than raising. Put it outside ``cached_statement`` so retries still share
+    in-flight fetches; the original signature is preserved for tool schemas.
+
+    Args:
+        upstream: Data source the tool calls; tools sharing one share a breaker
+        attempts: Total attempts (defaults to ``TOOL_RETRY_ATTEMPTS``)
+        base_delay: Backoff base in seconds (defaults to ``TOOL_RETRY_BASE_DELAY_SECONDS``)
+        max_delay: Backoff cap in seconds (defaults to ``TOOL_RETRY_MAX_DELAY_SECONDS``)
+        retry_on: Exception types treated as transient (defaults to ``TRANSIENT_ERRORS``);
+            ``ModelRetry`` is never caught and propagates to the model
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            breaker = circuit_breaker(upstream)
+            total = attempts if attempts is not None else TOOL_RETRY_ATTEMPTS
+            base = base_delay if base_delay is not None else TOOL_RETRY_BASE_DELAY_SECONDS
+            cap = max_delay if max_delay is not None else TOOL_RETRY_MAX_DELAY_SECONDS
+            error: Exception | None = None
+
+            for attempt in range(max(total, 1)):
+                if not breaker.allow():
+                    return ToolError(
+                        "upstream_unavailable",
+                        upstream,
+                        f"{upstream} is failing; not retrying it for now"
+                        + (f" (last error: {type(error).__name__}: {error})" if error else ""),
+                        attempts=attempt,
+                        retry_after_seconds=round(breaker.retry_after(), 2),
+                    ).as_dict()
+                try:
+                    result = await func(*args, **kwargs)
+                except ModelRetry:
+                    # A message for the model, not an upstream failure.
+                    breaker.release()
+                    raise
+                except retry_on as e:
+                    breaker.record_failure()
+                    error = e
+                    if attempt + 1 < total:
+                        tool_retry_counter.inc(tool=func.__name__, upstream=upstream)
+                        delay = backoff_delay(attempt, base, cap)
+                        logger.warning(
+                            f"{func.__name__} failed ({type(e).__name__}: {e}), retry {attempt + 1} in {delay:.2f}s"
+                        )
+                        await asyncio.sleep(delay)
+                    continue
+                except Exception as e:
+                    # Not worth retrying, but still a failed call to the upstream.
+                    breaker.record_failure()
+                    logger.warning(f"{func.__name__} failed ({type(e).__name__}: {e}), not retrying")
+                    return ToolError(
+                        "tool_failed", upstream, f"{type(e).__name__}: {e}", attempts=attempt + 1
+                    ).as_dict()
+                except BaseException:
+                    breaker.release()
+                    raise
+                breaker.record_success()
+                return result
+
+            return ToolError(
+                "tool_failed", upstream, f"{type(error).__name__}: {error}", attempts=total
+            ).as_dict()
+
+        return wrapper
+
+    return decorator